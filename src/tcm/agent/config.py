@@ -8,6 +8,8 @@ Config is stored at ~/.tcm/config.json and manages:
 - Agent settings
 """
 
+import copy
+from collections import ChainMap
 import json
 import os
 import logging
@@ -16,6 +18,11 @@ from typing import Any, Optional
 
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional: faster JSON (pip install tcm-cli[fast])
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 from rich.table import Table
@@ -37,6 +44,14 @@ VALID_LLM_PROVIDERS = frozenset({
 })
 logger = logging.getLogger("tcm.config")
 
+# Parsed config.json contents keyed by (path, mtime_ns) so repeated loads
+# within a process skip the read + JSON parse while the file is unchanged.
+_LOAD_CACHE: dict[tuple[str, int], dict] = {}
+# Last payload written per path with the file's mtime right after the write,
+# so saving an unchanged config is a no-op.
+_LAST_SAVED: dict[str, tuple[int, bytes]] = {}
+_json_decode = json.JSONDecoder().decode
+
 # Additional common providers for key storage/UX (may not be runtime-supported yet)
 PROVIDER_SPECS = {
     "anthropic": {"label": "Anthropic", "config_key": "llm.api_key", "env": "ANTHROPIC_API_KEY", "primary": True},
@@ -54,6 +69,16 @@ PROVIDER_SPECS = {
     "qwen":      {"label": "Qwen (DashScope)", "config_key": "llm.qwen_api_key", "env": "DASHSCOPE_API_KEY", "primary": False},
 }
 
+# provider -> (config key, env var) for fast API-key resolution
+_PROVIDER_LOOKUP = {
+    name: (spec["config_key"], spec.get("env")) for name, spec in PROVIDER_SPECS.items()
+}
+
+# Primary providers first, then the rest alphabetically (display order)
+PROVIDERS_SORTED = tuple(sorted(
+    PROVIDER_SPECS.items(), key=lambda kv: (0 if kv[1].get("primary") else 1, kv[0])
+))
+
 DEFAULTS = {
     "llm.provider": "anthropic",
     "llm.model": "claude-sonnet-4-5-20250929",
@@ -80,6 +105,9 @@ DEFAULTS = {
 
     # Model parameters
     "llm.temperature": 0.1,
+    # Reuse answers to identical low-temperature requests (e.g. re-plans)
+    "llm.response_cache": False,
+    "llm.response_cache_path": None,   # SQLite file to persist the cache across sessions
 
     "data.base": str(CONFIG_DIR / "data"),
     "data.tcmsp": None,
@@ -106,6 +134,8 @@ DEFAULTS = {
     "agent.executor_max_retries": 2,
     "agent.executor_loop_limit": 50,
     "agent.synthesis_max_tokens": 8192,
+    "agent.synthesis_cache_ttl_s": 60,
+    "agent.synthesis_skip_if_single": False,
     "agent.enforce_grounded_synthesis": True,
     "agent.confidence_scoring_enabled": True,
     "agent.min_step_success_rate": 0.5,
@@ -113,12 +143,23 @@ DEFAULTS = {
     "agent.max_hypotheses": 3,
     "agent.profile": "research",
     "agent.planner_max_tools": 60,
+    "agent.scratchpad_max": 10000,
     "agent.tool_health_enabled": True,
     "agent.tool_health_fail_threshold": 2,
     "agent.tool_health_failure_window_s": 1800,
     "agent.tool_health_suppress_seconds": 900,
 }
 
+_SORTED_DEFAULT_KEYS = tuple(sorted(DEFAULTS))
+_KNOWN_KEYS = frozenset(DEFAULTS)
+_DEFAULT_TYPES = {k: type(v) for k, v in DEFAULTS.items() if v is not None}
+# expected default type -> (accepted instance types, label used in issues)
+_TYPE_CHECKS = {
+    bool: ((bool,), "bool"),
+    int: ((int, float), "numeric"),
+    float: ((int, float), "numeric"),
+}
+
 AGENT_PROFILE_PRESETS = {
     "research": {
         "agent.enforce_grounded_synthesis": True,
@@ -138,35 +179,114 @@ AGENT_PROFILE_PRESETS = {
 }
 
 
+_llm_mod = None
+
+
+def _llm():
+    """Return the tcm.models.llm module, importing it on first use."""
+    global _llm_mod
+    if _llm_mod is None:
+        from tcm.models import llm as _llm_mod
+    return _llm_mod
+
+
+def mask_secret(value: str) -> str:
+    """Mask a secret for display, keeping only its first 7 and last 4 chars."""
+    return f"{value[:7]}...{value[-4:]}" if len(value) > 11 else "***"
+
+
+def _dump_config(data: dict) -> bytes:
+    """Serialize config data to indented JSON bytes with a trailing newline."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # fall back for values orjson can't encode
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
+
+
+def _invalidate_load_cache(path: str):
+    """Drop cached parses of the config file at ``path``."""
+    for key in [k for k in _LOAD_CACHE if k[0] == path]:
+        del _LOAD_CACHE[key]
+
+
 class Config:
     """Manages tcm configuration."""
 
     def __init__(self, data: dict = None):
         self._data = data or {}
+        self._chain = ChainMap(self._data, DEFAULTS)
+        # Bumped on every set(); lets holders of derived values notice changes
+        self.version = 0
 
     @classmethod
     def load(cls) -> "Config":
-        """Load config from ~/.tcm/config.json, falling back to defaults."""
-        if CONFIG_FILE.exists():
-            try:
-                raw = json.loads(CONFIG_FILE.read_text())
-                return cls(data=raw)
-            except (json.JSONDecodeError, OSError) as exc:
-                logger.warning("Failed to load config: %s", exc)
-        return cls()
+        """Load config from ~/.tcm/config.json, falling back to defaults.
+
+        Parsed contents are cached per (path, mtime) so unchanged files are
+        only read and decoded once per process.
+        """
+        path = str(CONFIG_FILE)
+        try:
+            mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
+            return cls()
+        except OSError as exc:
+            logger.warning("Failed to load config: %s", exc)
+            return cls()
+
+        key = (path, mtime_ns)
+        cached = _LOAD_CACHE.get(key)
+        if cached is not None:
+            return cls(data=copy.copy(cached))
+
+        try:
+            if orjson is not None:
+                raw = orjson.loads(CONFIG_FILE.read_bytes())
+            else:
+                raw = _json_decode(CONFIG_FILE.read_text())
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("Failed to load config: %s", exc)
+            return cls()
+        _invalidate_load_cache(path)
+        _LOAD_CACHE[key] = raw
+        return cls(data=copy.copy(raw))
 
     def save(self):
-        """Persist config to ~/.tcm/config.json."""
+        """Persist config to ~/.tcm/config.json.
+
+        Writes to a temp file and renames it over the target, so readers never
+        observe a partially written config. Skipped if nothing changed.
+        """
+        path = str(CONFIG_FILE)
+        payload = _dump_config(self._data)
+        last = _LAST_SAVED.get(path)
+        if last is not None and last[1] == payload:
+            try:
+                if CONFIG_FILE.stat().st_mtime_ns == last[0]:
+                    return
+            except OSError:
+                pass
+
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        CONFIG_FILE.write_text(json.dumps(self._data, indent=2) + "\n")
+        tmp = CONFIG_FILE.with_suffix(".json.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, CONFIG_FILE)
+
+        _invalidate_load_cache(path)
+        _LAST_SAVED[path] = (CONFIG_FILE.stat().st_mtime_ns, payload)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a config value, falling back to DEFAULTS then the provided default."""
-        if key in self._data:
-            return self._data[key]
-        if key in DEFAULTS:
-            return DEFAULTS[key]
-        return default
+        return self._chain.get(key, default)
 
     def set(self, key: str, value: Any):
         """Set a config value.
@@ -181,11 +301,11 @@ class Config:
                 f"Invalid provider '{value}'. Valid: {', '.join(sorted(VALID_LLM_PROVIDERS))}"
             )
         if key == "llm.model":
-            from tcm.models.llm import resolve_provider, MODEL_CATALOG
-            provider = resolve_provider(value)
+            llm = _llm()
+            provider = llm.resolve_provider(value)
             if provider:
                 self._data["llm.provider"] = provider
-            if value not in MODEL_CATALOG:
+            if value not in llm.MODEL_CATALOG:
                 logger.warning(
                     "Model '%s' is not in the catalog — it may still work if your provider supports it.",
                     value,
@@ -205,6 +325,7 @@ class Config:
                 raise ValueError("ui.language must be one of: en, zh, bi")
             value = norm
         self._data[key] = value
+        self.version += 1
 
     def set_llm_api_key(self, provider: str, api_key: Optional[str]):
         """Set API key for a specific provider, normalizing provider names.
@@ -221,6 +342,7 @@ class Config:
             )
         cfg_key = spec["config_key"]
         self._data[cfg_key] = api_key
+        self.version += 1
 
     def llm_api_key(self, provider: str = None) -> Optional[str]:
         """Get the API key for the given LLM provider.
@@ -228,32 +350,26 @@ class Config:
         Looks up provider-specific config key first, then environment fallback per PROVIDER_SPECS.
         """
         provider = (provider or self.get("llm.provider", "anthropic")).lower()
-        spec = PROVIDER_SPECS.get(provider)
-        if not spec:
+        lookup = _PROVIDER_LOOKUP.get(provider)
+        if not lookup:
             return None
-        cfg_key = spec["config_key"]
-        env = spec.get("env")
-        return self._data.get(cfg_key) or (os.environ.get(env) if env else None)
+        cfg_key, env = lookup
+        if not env:
+            return self._data.get(cfg_key) or None
+        return self._data.get(cfg_key) or os.environ.get(env)
 
     def validate(self) -> list[str]:
         """Validate configuration and return a list of issues."""
         issues = []
-        known_keys = set(DEFAULTS.keys())
-        for key in self._data:
-            if key not in known_keys:
-                issues.append(f"Unknown config key '{key}' (possible typo)")
-        # Type checks
         for key, value in self._data.items():
-            if key not in DEFAULTS or value is None:
+            if key not in _KNOWN_KEYS:
+                issues.append(f"Unknown config key '{key}' (possible typo)")
                 continue
-            default = DEFAULTS[key]
-            if default is None:
+            if value is None:
                 continue
-            expected_type = type(default)
-            if expected_type == bool and not isinstance(value, bool):
-                issues.append(f"'{key}' should be bool, got {type(value).__name__}")
-            elif expected_type in (int, float) and not isinstance(value, (int, float)):
-                issues.append(f"'{key}' should be numeric, got {type(value).__name__}")
+            check = _TYPE_CHECKS.get(_DEFAULT_TYPES.get(key))
+            if check and not isinstance(value, check[0]):
+                issues.append(f"'{key}' should be {check[1]}, got {type(value).__name__}")
         return issues
 
     def to_table(self) -> Table:
@@ -263,18 +379,18 @@ class Config:
         table.add_column("Value")
         table.add_column("Source", style="dim")
 
-        for key in sorted(DEFAULTS):
+        data = self._data
+        rows = []
+        for key in _SORTED_DEFAULT_KEYS:
+            val = self._chain[key]
             if key.endswith("api_key"):
-                val = self.get(key)
-                if val:
-                    val = val[:7] + "..." + val[-4:] if len(val) > 11 else "***"
-                else:
-                    val = "(not set)"
-                source = "config" if key in self._data else "default"
+                val = mask_secret(val) if val else "(not set)"
             else:
-                val = str(self.get(key))
-                source = "config" if key in self._data else "default"
-            table.add_row(key, val, source)
+                val = str(val)
+            rows.append((key, val, "config" if key in data else "default"))
+
+        for row in rows:
+            table.add_row(*row)
         return table
 
     def keys_table(self) -> Table:
@@ -284,14 +400,10 @@ class Config:
         table.add_column("Status")
         table.add_column("Description")
 
-        # Show primary providers first, then the rest alphabetically
-        def sort_key(item):
-            name, spec = item
-            return (0 if spec.get("primary") else 1, name)
-
-        for name, spec in sorted(PROVIDER_SPECS.items(), key=sort_key):
+        keys = {name: self.llm_api_key(name) for name in PROVIDER_SPECS}
+        for name, spec in PROVIDERS_SORTED:
             label = spec.get("label", name.title())
-            key = self.llm_api_key(name)
+            key = keys[name]
             if spec.get("primary"):
                 desc = "Primary LLM provider"
                 status = "[green]✓ configured[/green]" if key else "[red]✗ missing[/red]"
@@ -2,11 +2,20 @@
 Health checks for tcm CLI.
 """
 
+import importlib.util
 import shutil
 import sys
 from rich.table import Table
 
 
+def _is_installed(pkg: str) -> bool:
+    """Check whether a package is importable without actually importing it."""
+    try:
+        return importlib.util.find_spec(pkg) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def run_checks(config, session=None) -> list[dict]:
     """Run all health checks. Returns list of check results."""
     checks = []
@@ -30,18 +39,16 @@ def run_checks(config, session=None) -> list[dict]:
 
     # Core dependencies
     for pkg in ["anthropic", "rich", "typer", "httpx", "prompt_toolkit"]:
-        try:
-            __import__(pkg)
+        if _is_installed(pkg):
             checks.append({"name": f"Package: {pkg}", "status": "ok", "detail": "installed"})
-        except ImportError:
+        else:
             checks.append({"name": f"Package: {pkg}", "status": "error", "detail": "not installed"})
 
     # Optional dependencies
     for pkg, label in [("pandas", "pandas"), ("numpy", "numpy"), ("rdkit", "RDKit (chemistry)")]:
-        try:
-            __import__(pkg)
+        if _is_installed(pkg):
             checks.append({"name": f"Optional: {label}", "status": "ok", "detail": "installed"})
-        except ImportError:
+        else:
             checks.append({"name": f"Optional: {label}", "status": "info", "detail": "not installed (optional)"})
 
     # Tool loading
@@ -4,8 +4,10 @@ Plan executor: iterates plan steps, calls tools, handles errors/retries.
 
 import json
 import logging
+import random
+import re
 import time
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 
 from tcm.agent.session import Session
@@ -14,6 +16,11 @@ from tcm.tools import registry, ensure_loaded
 logger = logging.getLogger("tcm.agent.executor")
 console = Console()
 
+_tools_ready = False
+
+# "$step<N>" optionally followed by a dotted path, e.g. "$step1.output.targets"
+_STEP_RE = re.compile(r"\$step(\d+)((?:\.[^.]+)*)$")
+
 
 def execute_plan(session: Session, plan: dict, verbose: bool = False) -> list[dict]:
     """Execute a research plan step by step.
@@ -26,7 +33,10 @@ def execute_plan(session: Session, plan: dict, verbose: bool = False) -> list[di
     Returns:
         List of step results.
     """
-    ensure_loaded()
+    global _tools_ready
+    if not _tools_ready:
+        ensure_loaded()
+        _tools_ready = True
     steps = plan.get("steps", [])
     results = []
 
@@ -35,17 +45,16 @@ def execute_plan(session: Session, plan: dict, verbose: bool = False) -> list[di
         return [{"step": 0, "tool": "llm_direct", "result": plan.get("reasoning", ""), "status": "success"}]
 
     max_retries = int(session.config.get("agent.executor_max_retries", 2))
-
-    for step in steps:
-        step_num = step.get("step", len(results) + 1)
-        tool_name = step.get("tool", "")
-        parameters = step.get("parameters", {})
-        purpose = step.get("purpose", "")
-
-        if verbose:
-            console.print(f"  [cyan]Step {step_num}[/cyan]: {tool_name} — {purpose}")
-
-        tool = registry.get_tool(tool_name)
+    # Normalize steps to (step, tool, parameters, purpose) tuples once
+    plan_steps = [
+        (s.get("step", i), s.get("tool", ""), s.get("parameters") or {}, s.get("purpose", ""))
+        for i, s in enumerate(steps, 1)
+    ]
+    # Resolve every referenced tool once up front
+    tools = {name: registry.get_tool(name) for name in {ps[1] for ps in plan_steps}}
+
+    for step_num, tool_name, parameters, purpose in plan_steps:
+        tool = tools[tool_name]
         if not tool:
             result = {
                 "step": step_num,
@@ -53,22 +62,33 @@ def execute_plan(session: Session, plan: dict, verbose: bool = False) -> list[di
                 "status": "error",
                 "error": f"Tool '{tool_name}' not found.",
             }
-            results.append(result)
-            continue
-
-        # Substitute references to previous results
-        resolved_params = _resolve_params(parameters, results)
+        elif not isinstance(parameters, dict):
+            # A malformed step from the planner fails on its own, not the whole plan
+            result = {
+                "step": step_num,
+                "tool": tool_name,
+                "status": "error",
+                "error": f"Invalid parameters for '{tool_name}': expected an object, "
+                         f"got {type(parameters).__name__}.",
+            }
+        else:
+            # Substitute references to previous results
+            resolved_params = _resolve_params(parameters, results)
 
-        # Execute with retry
-        result = _execute_with_retry(session, tool, resolved_params, max_retries)
-        result["step"] = step_num
-        result["tool"] = tool_name
-        result["purpose"] = purpose
+            # Execute with retry
+            result = _execute_with_retry(session, tool, resolved_params, max_retries)
+            result["step"] = step_num
+            result["tool"] = tool_name
+            result["purpose"] = purpose
 
         if verbose:
-            status_icon = "✓" if result["status"] == "success" else "✗"
-            color = "green" if result["status"] == "success" else "red"
-            console.print(f"    [{color}]{status_icon}[/{color}] {result['status']}")
+            # One render per step instead of one per line
+            ok = result["status"] == "success"
+            color = "green" if ok else "red"
+            console.print(Group(
+                f"  [cyan]Step {step_num}[/cyan]: {tool_name} — {purpose}",
+                f"    [{color}]{'✓' if ok else '✗'}[/{color}] {result['status']}",
+            ))
 
         results.append(result)
 
@@ -89,34 +109,37 @@ def _execute_with_retry(session: Session, tool, parameters: dict, max_retries: i
 
             if attempt >= max_retries:
                 return {"status": "error", "error": error_text}
-            time.sleep(1)
+            time.sleep(_retry_delay(attempt))
 
     return {"status": "error", "error": "Max retries exceeded"}
 
 
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff (0.25s, 0.5s, ... capped at 2s) with jitter."""
+    delay = min(0.25 * (2 ** (attempt - 1)), 2.0)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 def _resolve_params(parameters: dict, previous_results: list) -> dict:
     """Resolve parameter references like '$step1.output.targets' to actual values."""
     resolved = {}
+    n_results = len(previous_results)
     for key, value in parameters.items():
-        if isinstance(value, str) and value.startswith("$step"):
-            try:
-                # Parse reference like "$step1.output.targets"
-                parts = value[1:].split(".")
-                step_ref = int(parts[0].replace("step", "")) - 1
-                if 0 <= step_ref < len(previous_results):
-                    result = previous_results[step_ref]
-                    obj = result
-                    for part in parts[1:]:
-                        if isinstance(obj, dict):
-                            obj = obj.get(part, value)
-                        else:
-                            obj = value
-                            break
-                    resolved[key] = obj
-                else:
-                    resolved[key] = value
-            except (ValueError, IndexError):
-                resolved[key] = value
-        else:
+        m = _STEP_RE.match(value) if isinstance(value, str) else None
+        if m is None:
             resolved[key] = value
+            continue
+        step_ref = int(m.group(1)) - 1
+        if not 0 <= step_ref < n_results:
+            resolved[key] = value
+            continue
+        obj = previous_results[step_ref]
+        path = m.group(2)
+        for part in (path[1:].split(".") if path else ()):
+            if isinstance(obj, dict):
+                obj = obj.get(part, value)
+            else:
+                obj = value
+                break
+        resolved[key] = obj
     return resolved
@@ -2,6 +2,7 @@
 Research planner: takes user query → calls LLM with tool catalog → returns ordered plan.
 """
 
+import functools
 import json
 import logging
 from tcm.agent.session import Session
@@ -9,6 +10,9 @@ from tcm.tools import registry, ensure_loaded
 
 logger = logging.getLogger("tcm.agent.planner")
 
+_tools_ready = False
+_json_decode = json.JSONDecoder().decode
+
 PLANNER_SYSTEM = """You are an expert Traditional Chinese Medicine (TCM) research assistant.
 You have access to a set of computational tools for TCM research.
 
@@ -38,19 +42,40 @@ AVAILABLE TOOLS:
 """
 
 
+def _strip_code_fence(content: str) -> str:
+    """Return the body of the first ```json (or bare ```) fence, if any."""
+    start = content.find("```json")
+    if start >= 0:
+        start += 7
+    else:
+        start = content.find("```")
+        if start < 0:
+            return content
+        start += 3
+    end = content.find("```", start)
+    return content[start:end if end >= 0 else None].strip()
+
+
+@functools.lru_cache(maxsize=32)
+def _tool_catalog(version: int, suppressed: frozenset) -> str:
+    """Tool catalog for the planner prompt, memoized per registry version."""
+    return registry.tool_descriptions_for_llm(exclude_tools=suppressed)
+
+
 def create_plan(session: Session, query: str, mention_context: str = "") -> dict:
     """Create a research plan for the given query.
 
     Returns:
         dict with 'reasoning' and 'steps' keys.
     """
-    ensure_loaded()
+    global _tools_ready
+    if not _tools_ready:
+        ensure_loaded()
+        _tools_ready = True
 
     # Build tool catalog for the planner
     suppressed = session.tool_health_suppressed_tools()
-    tool_catalog = registry.tool_descriptions_for_llm(
-        exclude_tools=suppressed,
-    )
+    tool_catalog = _tool_catalog(registry.version, frozenset(suppressed))
 
     system_prompt = PLANNER_SYSTEM + tool_catalog
 
@@ -70,18 +95,12 @@ def create_plan(session: Session, query: str, mention_context: str = "") -> dict
     # Parse the plan from LLM response
     try:
         # Try to extract JSON from the response
-        content = response.content.strip()
-        # Handle markdown code blocks
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-
-        plan = json.loads(content)
+        content = _strip_code_fence(response.content.strip())
+        plan = _json_decode(content)
         if "steps" not in plan:
             plan = {"reasoning": "Direct response", "steps": []}
         return plan
-    except (json.JSONDecodeError, IndexError):
+    except json.JSONDecodeError:
         logger.warning("Failed to parse plan JSON, returning raw response")
         return {
             "reasoning": response.content,
@@ -2,31 +2,67 @@
 Session management: holds config, LLM clients, and shared state for a tcm session.
 """
 
+import re
+import threading
 import time
+from collections import OrderedDict, deque
 from pathlib import Path
 from rich.console import Console
 
 from tcm.agent.config import Config
 
+# Error text markers for failures worth retrying/suppressing (network, rate limit, 5xx)
+_TRANSIENT_RE = re.compile(
+    r"timeout|timed out|connection|dns|service unavailable|rate limit|429|50[0234]",
+    re.IGNORECASE,
+)
+
+_SYNTH_CACHE_MAX = 64
+
+# Shared across sessions; constructing a Console probes the terminal each time
+_SHARED_CONSOLE = Console()
+
 
 class Session:
     """Manages state for a tcm research session."""
 
-    def __init__(self, config: Config = None, verbose: bool = False, mode: str = "batch"):
+    __slots__ = (
+        "config", "verbose", "mode", "console",
+        "_llm", "_llm_lock", "_response_cache", "_synth_cache", "_scratchpad",
+        "_tool_health_failures", "_tool_health_suppressed_until",
+        "_th_suppressed", "_th_next_expiry",
+        "_th_window_s", "_th_threshold", "_th_suppress_s", "_th_config_version",
+    )
+
+    def __init__(self, config: Config = None, verbose: bool = False, mode: str = "batch",
+                 console: Console = None):
         self.config = config or Config.load()
         self.verbose = verbose
         self.mode = mode  # "interactive" or "batch"
-        self.console = Console()
+        self.console = console or _SHARED_CONSOLE
         self._llm = None
-        self._scratchpad = []
-        self._tool_health_failures: dict[str, list[float]] = {}
+        self._llm_lock = threading.Lock()
+        self._response_cache = None
+        # Synthesized answers keyed by prompt digest -> (stored_at, text)
+        self._synth_cache: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._scratchpad = deque(maxlen=int(self.config.get("agent.scratchpad_max", 10000)))
+        self._tool_health_failures: dict[str, deque[float]] = {}
         self._tool_health_suppressed_until: dict[str, float] = {}
+        # Cached result of tool_health_suppressed_tools(), valid until the
+        # earliest suppression expires or the suppression map changes.
+        self._th_suppressed: frozenset[str] | None = None
+        self._th_next_expiry = 0.0
+        self.reload_tool_health_settings()
 
     def get_llm(self):
         """Get or create the LLM client based on config."""
-        if self._llm is None:
-            self._llm = self._create_llm()
-        return self._llm
+        llm = self._llm
+        if llm is None:
+            with self._llm_lock:
+                llm = self._llm
+                if llm is None:
+                    llm = self._llm = self._create_llm()
+        return llm
 
     def _create_llm(self):
         """Create LLM client from config."""
@@ -47,8 +83,18 @@ class Session:
             model=model,
             api_key=api_key,
             base_url=base_url,
+            cache=self._get_response_cache(),
         )
 
+    def _get_response_cache(self):
+        """Response cache shared by this session's LLM clients, if enabled."""
+        if not self.config.get("llm.response_cache", False):
+            return None
+        if self._response_cache is None:
+            from tcm.models.llm import ResponseCache
+            self._response_cache = ResponseCache(path=self.config.get("llm.response_cache_path"))
+        return self._response_cache
+
     def set_model(self, model: str, provider: str = None):
         """Switch the LLM model mid-session.
 
@@ -59,6 +105,7 @@ class Session:
         # Config.set("llm.model", ...) auto-detects provider
         self.config.set("llm.model", model)
         self._llm = None
+        self._synth_cache.clear()
 
     def refresh_llm(self):
         """Drop the cached LLM client so it reloads with new credentials."""
@@ -80,28 +127,60 @@ class Session:
     def save_scratchpad(self, path: Path):
         """Save scratchpad to file for debugging."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text("\n".join(self._scratchpad))
+        with path.open("w", encoding="utf-8", buffering=65536) as fh:
+            fh.writelines(f"{line}\n" for line in self._scratchpad)
+
+    # --- Synthesis answer cache ---
+
+    def get_cached_synthesis(self, key: bytes):
+        """Return a cached answer for ``key`` if present and within the TTL."""
+        entry = self._synth_cache.get(key)
+        if entry is None:
+            return None
+        ttl = float(self.config.get("agent.synthesis_cache_ttl_s", 60))
+        if time.monotonic() - entry[0] > ttl:
+            del self._synth_cache[key]
+            return None
+        self._synth_cache.move_to_end(key)
+        return entry[1]
+
+    def cache_synthesis(self, key: bytes, text: str):
+        """Store a synthesized answer, evicting the least recently used."""
+        if float(self.config.get("agent.synthesis_cache_ttl_s", 60)) <= 0:
+            return
+        self._synth_cache[key] = (time.monotonic(), text)
+        self._synth_cache.move_to_end(key)
+        while len(self._synth_cache) > _SYNTH_CACHE_MAX:
+            self._synth_cache.popitem(last=False)
 
     # --- Runtime tool-health tracking ---
 
+    def reload_tool_health_settings(self):
+        """Re-read tool-health thresholds from config (cached on the session)."""
+        cfg = self.config
+        self._th_config_version = cfg.version
+        self._th_window_s = max(60, int(cfg.get("agent.tool_health_failure_window_s", 1800)))
+        self._th_threshold = max(1, int(cfg.get("agent.tool_health_fail_threshold", 2)))
+        self._th_suppress_s = max(60, int(cfg.get("agent.tool_health_suppress_seconds", 900)))
+
+    def _sync_tool_health_settings(self):
+        # Picks up thresholds changed through Config.set() mid-session
+        if self.config.version != self._th_config_version:
+            self.reload_tool_health_settings()
+
     def _tool_health_enabled(self) -> bool:
         return bool(self.config.get("agent.tool_health_enabled", True))
 
     def _is_transient_tool_error(self, error_text: str) -> bool:
-        text = str(error_text or "").lower()
-        transient_markers = (
-            "timeout", "timed out", "connection", "dns",
-            "service unavailable", "rate limit", "429",
-            "500", "502", "503", "504",
-        )
-        return any(marker in text for marker in transient_markers)
+        return _TRANSIENT_RE.search(str(error_text or "")) is not None
 
     def record_tool_success(self, tool_name: str):
         """Clear runtime failure pressure after a successful execution."""
         if not tool_name:
             return
         self._tool_health_failures.pop(tool_name, None)
-        self._tool_health_suppressed_until.pop(tool_name, None)
+        if self._tool_health_suppressed_until.pop(tool_name, None) is not None:
+            self._th_suppressed = None
 
     def record_tool_failure(self, tool_name: str, error_text: str = ""):
         """Record transient tool failures and suppress flaky tools temporarily."""
@@ -109,24 +188,30 @@ class Session:
             return
         if not self._is_transient_tool_error(error_text):
             return
-
-        now = time.time()
-        window_s = max(60, int(self.config.get("agent.tool_health_failure_window_s", 1800)))
-        threshold = max(1, int(self.config.get("agent.tool_health_fail_threshold", 2)))
-        suppress_s = max(60, int(self.config.get("agent.tool_health_suppress_seconds", 900)))
-
-        history = [t for t in self._tool_health_failures.get(tool_name, []) if now - t <= window_s]
+        self._sync_tool_health_settings()
+
+        now = time.monotonic()
+        history = self._tool_health_failures.get(tool_name)
+        if history is None:
+            history = self._tool_health_failures[tool_name] = deque()
+        # Drop failures that fell out of the sliding window
+        cutoff = now - self._th_window_s
+        while history and history[0] < cutoff:
+            history.popleft()
         history.append(now)
-        self._tool_health_failures[tool_name] = history
 
-        if len(history) >= threshold:
-            self._tool_health_suppressed_until[tool_name] = now + suppress_s
+        if len(history) >= self._th_threshold:
+            self._tool_health_suppressed_until[tool_name] = now + self._th_suppress_s
+            self._th_suppressed = None
 
-    def tool_health_suppressed_tools(self) -> set[str]:
+    def tool_health_suppressed_tools(self) -> frozenset[str]:
         """Return tools currently suppressed due to repeated transient failures."""
-        if not self._tool_health_enabled():
-            return set()
-        now = time.time()
+        if not self._tool_health_enabled() or not self._tool_health_suppressed_until:
+            return frozenset()
+        now = time.monotonic()
+        if self._th_suppressed is not None and now < self._th_next_expiry:
+            return self._th_suppressed
+
         suppressed = set()
         expired = []
         for name, until in self._tool_health_suppressed_until.items():
@@ -137,4 +222,7 @@ class Session:
         for name in expired:
             self._tool_health_suppressed_until.pop(name, None)
             self._tool_health_failures.pop(name, None)
-        return suppressed
+
+        self._th_suppressed = frozenset(suppressed)
+        self._th_next_expiry = min(self._tool_health_suppressed_until.values(), default=now)
+        return self._th_suppressed
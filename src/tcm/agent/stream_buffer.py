@@ -0,0 +1,64 @@
+"""
+Stream coalescing: merges tiny LLM token chunks into fewer, larger writes.
+"""
+
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+
+class CoalescingBuffer:
+    """Buffers streamed text and flushes it by size or elapsed time.
+
+    The first chunk is always emitted immediately so time-to-first-token is
+    unaffected; after that, text is held until ``max_chars`` accumulate or
+    ``max_interval_s`` has passed since the last flush.
+    """
+
+    def __init__(self, max_chars: int = 8192, max_interval_s: float = 0.025):
+        self.max_chars = max_chars
+        self.max_interval_s = max_interval_s
+
+    def _due(self, size: int, last_flush, now: float) -> bool:
+        return (
+            last_flush is None
+            or size >= self.max_chars
+            or now - last_flush >= self.max_interval_s
+        )
+
+    def wrap(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield coalesced text from an iterable of text chunks."""
+        pending: list[str] = []
+        size = 0
+        last_flush = None
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pending.append(chunk)
+            size += len(chunk)
+            now = time.monotonic()
+            if self._due(size, last_flush, now):
+                yield "".join(pending)
+                pending.clear()
+                size = 0
+                last_flush = now
+        if pending:
+            yield "".join(pending)
+
+    async def awrap(self, chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+        """Async counterpart of wrap() for async chunk sources."""
+        pending: list[str] = []
+        size = 0
+        last_flush = None
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            pending.append(chunk)
+            size += len(chunk)
+            now = time.monotonic()
+            if self._due(size, last_flush, now):
+                yield "".join(pending)
+                pending.clear()
+                size = 0
+                last_flush = now
+        if pending:
+            yield "".join(pending)
@@ -2,9 +2,18 @@
 Synthesizer: takes tool results → produces structured research answer.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 from tcm.agent.session import Session
+from tcm.agent.stream_buffer import CoalescingBuffer
+
+try:
+    import orjson  # optional: faster JSON (pip install tcm-cli[fast])
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("tcm.agent.synthesizer")
 
@@ -49,9 +58,41 @@ def _lang_instructions(lang: str) -> str:
 
 
 def _build_synthesis_system(lang: str) -> str:
+    return _synthesis_system_for((lang or "en").lower())
+
+
+@functools.lru_cache(maxsize=8)
+def _synthesis_system_for(lang: str) -> str:
     return BASE_SYNTHESIS_SYSTEM + "\n" + _lang_instructions(lang)
 
 
+def _is_direct(results: list[dict]) -> bool:
+    """True when the plan had no tool steps and the planner answered directly."""
+    return len(results) == 1 and results[0].get("tool") == "llm_direct"
+
+
+def _looks_like_final_markdown(text: str) -> bool:
+    """Heuristic: a substantial markdown document with a heading near the top."""
+    return len(text) > 200 and "## " in text[:200]
+
+
+def _single_result_markdown(session: Session, results: list[dict]):
+    """Return a lone tool result's markdown if it can be shown as-is.
+
+    Only active with agent.synthesis_skip_if_single; saves the synthesis LLM
+    call when a single successful step already produced a finished answer.
+    """
+    if len(results) != 1 or results[0].get("status") != "success":
+        return None
+    if not session.config.get("agent.synthesis_skip_if_single", False):
+        return None
+    output = results[0].get("output")
+    text = output.get("markdown") if isinstance(output, dict) else output
+    if isinstance(text, str) and _looks_like_final_markdown(text):
+        return text
+    return None
+
+
 def synthesize(session: Session, query: str, plan: dict, results: list[dict]) -> str:
     """Synthesize tool results into a final answer.
 
@@ -64,50 +105,103 @@ def synthesize(session: Session, query: str, plan: dict, results: list[dict]) ->
     Returns:
         Synthesized answer as markdown string.
     """
-    # Check for direct LLM response (no tool steps)
-    if len(results) == 1 and results[0].get("tool") == "llm_direct":
+    if _is_direct(results):
         return results[0].get("result", "")
+    final = _single_result_markdown(session, results)
+    if final is not None:
+        return final
+    return "".join(synthesize_streaming(session, query, plan, results))
 
-    # Build context from results
-    results_summary = _format_results(results)
 
-    user_message = f"""**User Question:** {query}
+def synthesize_streaming(session: Session, query: str, plan: dict, results: list[dict]):
+    """Synthesize with streaming — yields text chunks.
 
-**Plan Reasoning:** {plan.get('reasoning', 'N/A')}
+    Usage:
+        for chunk in synthesize_streaming(session, query, plan, results):
+            print(chunk, end="", flush=True)
+    """
+    # Direct answers never touch (or construct) the LLM client
+    if _is_direct(results):
+        yield results[0].get("result", "")
+        return
+    final = _single_result_markdown(session, results)
+    if final is not None:
+        yield final
+        return
 
-**Tool Results:**
-{results_summary}
+    lang = session.config.get("ui.language", "en")
+    system, user_message = _prepare_prompt(query, plan, results, lang)
 
-Please synthesize these results into a comprehensive answer."""
+    # Identical repeats (e.g. "try again") are served from the session cache
+    cache_key = _synthesis_cache_key(session.current_model, lang, user_message)
+    cached = session.get_cached_synthesis(cache_key)
+    if cached is not None:
+        yield cached
+        return
 
-    llm = session.get_llm()
+    llm = _warm_llm(session)
     max_tokens = int(session.config.get("agent.synthesis_max_tokens", 8192))
-    lang = session.config.get("ui.language", "en")
 
-    # Use streaming for synthesis
-    chunks = []
-    for chunk in llm.stream(
-        system=_build_synthesis_system(lang),
+    # Coalesce per-token deltas so consumers render fewer, larger writes
+    parts = []
+    for chunk in CoalescingBuffer().wrap(llm.stream(
+        system=system,
         messages=[{"role": "user", "content": user_message}],
         temperature=0.2,
         max_tokens=max_tokens,
-    ):
-        chunks.append(chunk)
+    )):
+        parts.append(chunk)
+        yield chunk
+    session.cache_synthesis(cache_key, "".join(parts))
 
-    return "".join(chunks)
 
+async def synthesize_streaming_async(session: Session, query: str, plan: dict,
+                                     results: list[dict]):
+    """Async version of synthesize_streaming — an async generator of text chunks.
 
-def synthesize_streaming(session: Session, query: str, plan: dict, results: list[dict]):
-    """Synthesize with streaming — yields text chunks.
-
-    Usage:
-        for chunk in synthesize_streaming(session, query, plan, results):
-            print(chunk, end="", flush=True)
+    Lets callers overlap several syntheses, e.g. with asyncio.gather.
     """
-    if len(results) == 1 and results[0].get("tool") == "llm_direct":
+    if _is_direct(results):
         yield results[0].get("result", "")
         return
+    final = _single_result_markdown(session, results)
+    if final is not None:
+        yield final
+        return
+
+    lang = session.config.get("ui.language", "en")
+    system, user_message = _prepare_prompt(query, plan, results, lang)
+
+    cache_key = _synthesis_cache_key(session.current_model, lang, user_message)
+    cached = session.get_cached_synthesis(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    llm = await asyncio.to_thread(_warm_llm, session)
+    max_tokens = int(session.config.get("agent.synthesis_max_tokens", 8192))
 
+    parts = []
+    async for chunk in CoalescingBuffer().awrap(llm.astream(
+        system=system,
+        messages=[{"role": "user", "content": user_message}],
+        temperature=0.2,
+        max_tokens=max_tokens,
+    )):
+        parts.append(chunk)
+        yield chunk
+    session.cache_synthesis(cache_key, "".join(parts))
+
+
+def _warm_llm(session: Session):
+    """Create the session's LLM client and its underlying SDK client."""
+    llm = session.get_llm()
+    llm.warmup()
+    return llm
+
+
+def _prepare_prompt(query: str, plan: dict, results: list[dict], lang: str) -> tuple[str, str]:
+    """Build the (system, user) prompt pair for synthesis."""
     results_summary = _format_results(results)
 
     user_message = f"""**User Question:** {query}
@@ -119,37 +213,115 @@ def synthesize_streaming(session: Session, query: str, plan: dict, results: list
 
 Please synthesize these results into a comprehensive answer."""
 
-    llm = session.get_llm()
-    max_tokens = int(session.config.get("agent.synthesis_max_tokens", 8192))
-    lang = session.config.get("ui.language", "en")
+    return _build_synthesis_system(lang), user_message
 
-    for chunk in llm.stream(
-        system=_build_synthesis_system(lang),
-        messages=[{"role": "user", "content": user_message}],
-        temperature=0.2,
-        max_tokens=max_tokens,
-    ):
-        yield chunk
+
+def _synthesis_cache_key(model: str, lang: str, user_message: str) -> bytes:
+    """Digest identifying a synthesis request for the session answer cache."""
+    payload = "\x00".join((model or "", lang or "", user_message)).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Characters of encoded tool output shown per step in the synthesis prompt
+_MAX_OUTPUT_CHARS = 3000
+
+
+def _truncate_for_prompt(obj, max_chars: int = _MAX_OUTPUT_CHARS):
+    """Return a copy of a tool output pruned to roughly ``max_chars`` of JSON.
+
+    Applied before serialization so huge payloads are not fully encoded only
+    to be sliced down to the prompt budget afterwards. Only material that
+    would land past ``max_chars`` in the encoding is dropped, so an output
+    that fits the budget passes through unchanged.
+    """
+    return _prune(obj, max_chars)[0]
+
+
+def _prune(obj, budget: int) -> tuple:
+    """Prune ``obj`` to ``budget`` chars; returns (copy, lower bound on its encoded length).
+
+    Sizes are lower bounds on the compact encoding, so nothing that would
+    have fitted is cut; a cut is marked with a sentinel and costs the whole
+    remaining budget, which stops the enclosing containers too.
+    """
+    if isinstance(obj, str):
+        if len(obj) + 2 > budget:
+            keep = max(budget, 0)
+            return obj[:keep] + "... (truncated)", keep + 2
+        return obj, len(obj) + 2
+    if isinstance(obj, dict):
+        pruned = {}
+        used = 1
+        for i, (key, value) in enumerate(obj.items()):
+            if used >= budget:
+                pruned["..."] = f"(truncated {len(obj) - i} more)"
+                break
+            if i:
+                used += 1  # comma
+            used += (len(key) if isinstance(key, str) else 1) + 3  # quotes and colon
+            pruned[key], size = _prune(value, budget - used)
+            used += size
+        return pruned, used + 1
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(obj)
+        pruned = []
+        used = 1
+        for i, value in enumerate(items):
+            if used >= budget:
+                pruned.append(f"... (truncated {len(items) - i} more)")
+                break
+            if i:
+                used += 1  # comma
+            value, size = _prune(value, budget - used)
+            pruned.append(value)
+            used += size
+        return pruned, used + 1
+    if type(obj) is int:
+        return obj, len(str(obj))
+    return obj, 1
+
+
+# datetime/UUID/dataclass values are encoded natively; naive datetimes as UTC
+_ORJSON_OPTS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_DATACLASS
+    | orjson.OPT_SERIALIZE_UUID | orjson.OPT_NAIVE_UTC
+) if orjson is not None else 0
+
+
+def _last_resort_str(obj) -> str:
+    """orjson fallback for types it has no native encoder for (Path, Decimal, ...)."""
+    return str(obj)
+
+
+def _dumps_output(output) -> str:
+    """Serialize a tool output compactly for the prompt."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(output, default=_last_resort_str, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            pass  # e.g. keys orjson can't coerce; use the stdlib path
+    return json.dumps(output, ensure_ascii=False, default=str)
+
+
+_SUCCESS_TMPL = "### Step {}: {}\n**Purpose:** {}\n**Status:** ✓ Success\n```json\n{}\n```\n"
+_ERROR_TMPL = "### Step {}: {}\n**Purpose:** {}\n**Status:** ✗ Error: {}\n"
+
+
+def _render_result(r: dict) -> str:
+    """Render one step result as a markdown section."""
+    step = r.get("step", "?")
+    tool = r.get("tool", "unknown")
+    purpose = r.get("purpose", "")
+
+    if r.get("status", "unknown") == "success":
+        output_str = _dumps_output(_truncate_for_prompt(r.get("output", {})))
+        # Truncate very long outputs
+        if len(output_str) > _MAX_OUTPUT_CHARS:
+            output_str = output_str[:_MAX_OUTPUT_CHARS] + "\n... (truncated)"
+        return _SUCCESS_TMPL.format(step, tool, purpose, output_str)
+    return _ERROR_TMPL.format(step, tool, purpose, r.get("error", "Unknown error"))
 
 
 def _format_results(results: list[dict]) -> str:
     """Format tool results for the synthesizer prompt."""
-    parts = []
-    for r in results:
-        step = r.get("step", "?")
-        tool = r.get("tool", "unknown")
-        status = r.get("status", "unknown")
-        purpose = r.get("purpose", "")
-
-        if status == "success":
-            output = r.get("output", {})
-            output_str = json.dumps(output, ensure_ascii=False, indent=2, default=str)
-            # Truncate very long outputs
-            if len(output_str) > 3000:
-                output_str = output_str[:3000] + "\n... (truncated)"
-            parts.append(f"### Step {step}: {tool}\n**Purpose:** {purpose}\n**Status:** ✓ Success\n```json\n{output_str}\n```\n")
-        else:
-            error = r.get("error", "Unknown error")
-            parts.append(f"### Step {step}: {tool}\n**Purpose:** {purpose}\n**Status:** ✗ Error: {error}\n")
-
-    return "\n".join(parts)
+    return "\n".join(_render_result(r) for r in results)
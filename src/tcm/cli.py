@@ -8,29 +8,34 @@ Usage:
     tcm data pull tcmsp              # Data management
 """
 
+import functools
 import os
 import sys
-import getpass
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 from pathlib import Path
 
-import click
 import typer
 from rich.console import Console
-from rich.panel import Panel
 
 from tcm import __version__
-from tcm.agent.session import Session
+from tcm.ui.errors import is_auth_error
+from tcm.ui.secure_input import secure_input
+
+if TYPE_CHECKING:
+    import click
+
+    from tcm.agent.session import Session
 
 
 class TCMGroup(typer.core.TyperGroup):
     """Custom group that treats unrecognized commands as query text."""
 
-    def invoke(self, ctx: click.Context) -> Any:
+    def invoke(self, ctx: "click.Context") -> Any:
         # If the first positional arg is not a known subcommand,
         # move everything into ctx.args so the callback handles it as a query.
         if ctx._protected_args:
-            cmd_name = click.utils.make_str(ctx._protected_args[0])
+            first = ctx._protected_args[0]
+            cmd_name = first if isinstance(first, str) else first.decode(sys.getfilesystemencoding(), "replace")
             if self.get_command(ctx, cmd_name) is None:
                 ctx.args = [*ctx._protected_args, *ctx.args]
                 ctx._protected_args = []
@@ -45,6 +50,11 @@ BANNER = """
 [bold #a48642]   ╚═╝    ╚═════╝╚═╝     ╚═╝[/]
 """
 
+_STATUS_TEMPLATE = (
+    f"  [bold]TCM CLI[/bold] v{__version__} | "
+    "model: [cyan]{model}[/cyan] | tools: [green]{tools}[/green]"
+)
+
 app = typer.Typer(
     name="tcm",
     cls=TCMGroup,
@@ -60,6 +70,16 @@ app = typer.Typer(
 )
 console = Console()
 
+_config_mod = None
+
+
+def _config():
+    """Return the tcm.agent.config module, importing it on first use."""
+    global _config_mod
+    if _config_mod is None:
+        from tcm.agent import config as _config_mod
+    return _config_mod
+
 
 # ─── Config subcommand ────────────────────────────────────────
 
@@ -70,8 +90,7 @@ app.add_typer(config_app, name="config")
 @config_app.command("set")
 def config_set(key: str, value: str):
     """Set a configuration value."""
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     try:
         cfg.set(key, value)
     except ValueError as exc:
@@ -84,8 +103,7 @@ def config_set(key: str, value: str):
 @config_app.command("get")
 def config_get(key: str):
     """Get a configuration value."""
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     val = cfg.get(key)
     console.print(f"  {key} = {val}")
 
@@ -93,16 +111,14 @@ def config_get(key: str):
 @config_app.command("show")
 def config_show():
     """Show all configuration."""
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     console.print(cfg.to_table())
 
 
 @config_app.command("validate")
 def config_validate():
     """Validate configuration and report issues."""
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     issues = cfg.validate()
     if not issues:
         console.print("[green]Configuration is valid.[/green]")
@@ -120,9 +136,9 @@ def setup_cmd(
     api_key: Optional[str] = typer.Option(None, "--api-key", help="Anthropic API key (non-interactive)"),
 ):
     """Interactive setup wizard — configure tcm for first use."""
-    from tcm.agent.config import Config
+    from rich.panel import Panel
 
-    cfg = Config.load()
+    cfg = _config().Config.load()
 
     console.print()
     console.print(Panel(
@@ -135,31 +151,30 @@ def setup_cmd(
     console.print()
 
     existing_key = cfg.llm_api_key()
+    # Provider keys exported in the environment, read once
+    provider_specs = _config().PROVIDER_SPECS
+    env_keys = {}
+    for name, spec in provider_specs.items():
+        value = os.environ.get(spec["env"]) if spec.get("env") else None
+        if value:
+            env_keys[name] = value
 
     if api_key:
         chosen_key = api_key
     elif existing_key:
-        masked = existing_key[:7] + "..." + existing_key[-4:] if len(existing_key) > 11 else "***"
+        masked = _mask_key(existing_key)
         console.print(f"  API key already configured: [green]{masked}[/green]")
-        try:
-            keep = input("  Keep existing key? [Y/n] ").strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n  [dim]Setup cancelled.[/dim]")
-            raise typer.Exit()
+        keep = _prompt("  Keep existing key? [Y/n] ", cancel="Setup cancelled.").lower()
         if keep in ("", "y", "yes"):
             chosen_key = existing_key
         else:
             chosen_key = _prompt_api_key()
     else:
-        env_key = os.environ.get("ANTHROPIC_API_KEY")
+        env_key = env_keys.get("anthropic")
         if env_key:
-            masked = env_key[:7] + "..." + env_key[-4:] if len(env_key) > 11 else "***"
+            masked = _mask_key(env_key)
             console.print(f"  Found ANTHROPIC_API_KEY in environment: [green]{masked}[/green]")
-            try:
-                save_it = input("  Save to tcm config? [Y/n] ").strip().lower()
-            except (EOFError, KeyboardInterrupt):
-                console.print("\n  [dim]Setup cancelled.[/dim]")
-                raise typer.Exit()
+            save_it = _prompt("  Save to tcm config? [Y/n] ", cancel="Setup cancelled.").lower()
             if save_it in ("", "y", "yes"):
                 chosen_key = env_key
             else:
@@ -172,6 +187,10 @@ def setup_cmd(
     cfg.save()
     console.print("\n  [green]API key saved to ~/.tcm/config.json[/green]")
 
+    others = [provider_specs[name]["label"] for name in env_keys if name != "anthropic"]
+    if others:
+        console.print(f"  [dim]Also found in environment (used automatically): {', '.join(others)}[/dim]")
+
     # Health check
     console.print("\n  [cyan]Running health check...[/cyan]")
     from tcm.agent.doctor import run_checks, to_table, has_errors
@@ -195,16 +214,25 @@ def setup_cmd(
     ))
 
 
+def _prompt(prompt: str, *, secret: bool = False, cancel: str = "Cancelled.") -> str:
+    """Read a stripped line from the user; EOF or Ctrl-C prints ``cancel`` and exits."""
+    try:
+        return (secure_input if secret else input)(prompt).strip()
+    except (EOFError, KeyboardInterrupt):
+        console.print(f"\n  [dim]{cancel}[/dim]")
+        raise typer.Exit()
+
+
+def _mask_key(key: Optional[str]) -> str:
+    """Mask an API key for display; empty keys read as cleared."""
+    return _config().mask_secret(key) if key else "(cleared)"
+
+
 def _prompt_api_key() -> str:
     """Prompt user for API key."""
     console.print("  Get your key at: [link=https://console.anthropic.com/settings/keys]console.anthropic.com/settings/keys[/link]")
     console.print()
-    try:
-        key = getpass.getpass("  Enter your Anthropic API key: ")
-    except (EOFError, KeyboardInterrupt):
-        console.print("\n  [dim]Setup cancelled.[/dim]")
-        raise typer.Exit()
-    return key.strip()
+    return _prompt("  Enter your Anthropic API key: ", secret=True, cancel="Setup cancelled.")
 
 
 # ─── Doctor command ───────────────────────────────────────────
@@ -212,10 +240,9 @@ def _prompt_api_key() -> str:
 @app.command("doctor")
 def doctor_cmd():
     """Run environment and configuration health checks."""
-    from tcm.agent.config import Config
     from tcm.agent.doctor import run_checks, to_table, has_errors
 
-    cfg = Config.load()
+    cfg = _config().Config.load()
     checks = run_checks(cfg)
     console.print(to_table(checks))
 
@@ -235,15 +262,13 @@ def keys_default(ctx: typer.Context):
     """Default action shows key status when no subcommand is given."""
     if ctx.invoked_subcommand is not None:
         return
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     console.print(cfg.keys_table())
 
 @keys_app.command("show")
 def keys_show_cmd():
     """Show status of API keys."""
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     console.print(cfg.keys_table())
 
 @keys_app.command("set")
@@ -253,27 +278,20 @@ def keys_set_cmd(
     make_default: bool = typer.Option(False, "--make-default", help="Also set llm.provider to this provider (only if supported)"),
 ):
     """Set the API key for a given provider. Interactive if options omitted."""
-    from tcm.agent.config import Config, PROVIDER_SPECS, VALID_LLM_PROVIDERS
-
-    cfg = Config.load()
+    cfg_mod = _config()
+    cfg = cfg_mod.Config.load()
 
     # Choose provider interactively if not specified
     prov = (provider or "").strip().lower()
     if not prov:
         console.print("  Choose a provider to configure:\n")
-        items = list(PROVIDER_SPECS.items())
-        # Primary first
-        items.sort(key=lambda kv: (0 if kv[1].get("primary") else 1, kv[0]))
+        items = cfg_mod.PROVIDERS_SORTED
         for idx, (name, spec) in enumerate(items, 1):
             label = spec.get("label", name.title())
             note = " (primary)" if spec.get("primary") else ""
             console.print(f"   {idx}. {label}{note}")
         console.print()
-        try:
-            choice = input("  Enter number: ").strip()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n  [dim]Cancelled.[/dim]")
-            raise typer.Exit()
+        choice = _prompt("  Enter number: ")
         try:
             idx = int(choice)
             if idx < 1 or idx > len(items):
@@ -285,11 +303,7 @@ def keys_set_cmd(
 
     if prov == "ollama":
         console.print("  [yellow]Ollama typically does not require an API key.[/yellow]")
-        try:
-            confirm = input("  Save a placeholder anyway? [y/N] ").strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n  [dim]Cancelled.[/dim]")
-            raise typer.Exit()
+        confirm = _prompt("  Save a placeholder anyway? [y/N] ").lower()
         if confirm not in ("y", "yes"):
             console.print("  [dim]No changes made.[/dim]")
             return
@@ -297,40 +311,43 @@ def keys_set_cmd(
     # Prompt for key if not provided
     key_val = api_key
     if key_val is None:
-        label = PROVIDER_SPECS.get(prov, {}).get("label", prov.title())
-        try:
-            key_val = getpass.getpass(f"  Enter your {label} API key: ").strip()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n  [dim]Cancelled.[/dim]")
-            raise typer.Exit()
+        label = cfg_mod.PROVIDER_SPECS.get(prov, {}).get("label", prov.title())
+        key_val = _prompt(f"  Enter your {label} API key: ", secret=True)
 
-    # Save
     try:
         cfg.set_llm_api_key(prov, key_val)
     except ValueError as exc:
         console.print(f"[red]{exc}[/red]")
         raise typer.Exit(code=2)
-    cfg.save()
-
-    masked = (key_val[:7] + "..." + key_val[-4:]) if key_val and len(key_val) > 11 else ("***" if key_val else "(cleared)")
-    console.print(f"  [green]Saved[/green] key for provider [bold]{prov}[/bold]: {masked}")
 
     # Optionally set as default provider (only for runtime-supported ones)
+    default_error = None
+    if make_default and prov in cfg_mod.VALID_LLM_PROVIDERS:
+        try:
+            cfg.set("llm.provider", prov)
+        except ValueError as exc:
+            default_error = exc
+
+    # Single write for the key and the default provider
+    try:
+        cfg.save()
+    except OSError as exc:
+        console.print(f"[red]Could not save config: {exc}[/red]")
+        raise typer.Exit(code=1)
+
+    console.print(f"  [green]Saved[/green] key for provider [bold]{prov}[/bold]: {_mask_key(key_val)}")
+
     if make_default:
-        if prov in VALID_LLM_PROVIDERS:
-            try:
-                cfg.set("llm.provider", prov)
-                cfg.save()
-                console.print(f"  [green]Default provider set to[/green] {prov}")
-            except ValueError as exc:
-                console.print(f"[red]{exc}[/red]")
-                raise typer.Exit(code=2)
+        if default_error is not None:
+            console.print(f"[red]{default_error}[/red]")
+            raise typer.Exit(code=2)
+        if prov in cfg_mod.VALID_LLM_PROVIDERS:
+            console.print(f"  [green]Default provider set to[/green] {prov}")
         else:
             console.print(
                 f"  [yellow]Note:[/yellow] {prov} keys saved, but runtime provider support is not enabled yet."
             )
 
-
 # ─── Data subcommand ─────────────────────────────────────────
 
 data_app = typer.Typer(help="Manage local datasets")
@@ -398,8 +415,7 @@ def model_list_cmd():
     from tcm.models.llm import list_models
     from rich.table import Table
 
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
     current = cfg.get("llm.model")
 
     table = Table(title="Available Models")
@@ -412,19 +428,22 @@ def model_list_cmd():
     table.add_column("$/M out", justify="right")
     table.add_column("Description")
 
-    for i, m in enumerate(list_models(), 1):
-        marker = " ●" if m.id == current else ""
-        ctx = f"{m.context_window:,}"
-        table.add_row(
+    rows = [
+        (
             str(i),
-            f"{m.id}{marker}",
+            f"{m.id} ●" if m.id == current else m.id,
             m.provider,
             m.display_name,
-            ctx,
+            f"{m.context_window:,}",
             f"${m.input_price:.2f}",
             f"${m.output_price:.2f}",
             m.description,
         )
+        for i, m in enumerate(list_models(), 1)
+    ]
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     console.print(table)
 
 
@@ -433,15 +452,14 @@ def model_set_cmd(
     model: str = typer.Argument(help="Model ID to use (e.g. gpt-4o, claude-sonnet-4-5-20250929)"),
 ):
     """Set the active model (provider is auto-detected)."""
-    from tcm.agent.config import Config
-    from tcm.models.llm import resolve_provider, MODEL_CATALOG
+    from tcm.models.llm import MODEL_IDS
 
-    cfg = Config.load()
+    cfg = _config().Config.load()
     cfg.set("llm.model", model)
     cfg.save()
 
     provider = cfg.get("llm.provider")
-    if model in MODEL_CATALOG:
+    if model in MODEL_IDS:
         console.print(f"  [green]Model set to[/green] {model} [dim](provider: {provider})[/dim]")
     else:
         console.print(
@@ -454,10 +472,9 @@ def model_set_cmd(
 def model_google_cmd():
     """List models available from the Google Gemini API (requires GOOGLE_API_KEY)."""
     from tcm.models.llm import list_google_models
-    from tcm.agent.config import Config
     from rich.table import Table
 
-    cfg = Config.load()
+    cfg = _config().Config.load()
     api_key = cfg.get("llm.google_api_key") or None
 
     try:
@@ -493,10 +510,9 @@ def model_google_cmd():
 @model_app.command("show")
 def model_show_cmd():
     """Show current model and provider."""
-    from tcm.agent.config import Config
     from tcm.models.llm import MODEL_CATALOG
 
-    cfg = Config.load()
+    cfg = _config().Config.load()
     model = cfg.get("llm.model")
     provider = cfg.get("llm.provider")
     info = MODEL_CATALOG.get(model)
@@ -520,16 +536,22 @@ app.add_typer(report_app, name="report")
 @report_app.command("list")
 def report_list():
     """List saved reports."""
+    import heapq
+
     reports_dir = Path.cwd() / "outputs"
-    if not reports_dir.exists():
-        console.print("  [dim]No reports found.[/dim]")
-        return
-    md_files = sorted(reports_dir.glob("*.md"), reverse=True)
-    if not md_files:
+    try:
+        with os.scandir(reports_dir) as it:
+            # Newest 20 by name (report filenames are date-prefixed)
+            names = heapq.nlargest(
+                20, (e.name for e in it if e.name.endswith(".md") and e.is_file())
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        names = []
+    if not names:
         console.print("  [dim]No reports found.[/dim]")
         return
-    for f in md_files[:20]:
-        console.print(f"  {f.name}")
+    for name in names:
+        console.print(f"  {name}")
 
 
 # ─── Version command ──────────────────────────────────────────
@@ -555,10 +577,15 @@ def main(
         return
 
     # Collect positional args as the query string (avoids conflict with subcommand routing)
-    query = " ".join(ctx.args).strip() if ctx.args else None
+    args = ctx.args
+    if not args:
+        query = None
+    elif len(args) == 1:
+        query = args[0].strip() or None
+    else:
+        query = " ".join(a for a in args if a).strip() or None
 
-    from tcm.agent.config import Config
-    cfg = Config.load()
+    cfg = _config().Config.load()
 
     if model:
         cfg.set("llm.model", model)
@@ -569,6 +596,7 @@ def main(
             console.print(f"[red]{exc}[/red]")
             raise typer.Exit(code=2)
 
+    from tcm.agent.session import Session
     session = Session(config=cfg, verbose=verbose)
 
     if query:
@@ -579,7 +607,7 @@ def main(
         _run_interactive(session)
 
 
-def _run_single_query(session: Session, query: str, verbose: bool):
+def _run_single_query(session: "Session", query: str, verbose: bool):
     """Execute a single query and print result."""
     from tcm.agent.planner import create_plan
     from tcm.agent.executor import execute_plan
@@ -589,14 +617,14 @@ def _run_single_query(session: Session, query: str, verbose: bool):
         with console.status("[bold cyan]Planning...[/bold cyan]"):
             plan = create_plan(session, query)
     except Exception as exc:
-        if _is_auth_error(exc):
+        if is_auth_error(exc):
             if _handle_auth_error(session):
                 # Retry once after updating credentials
                 try:
                     with console.status("[bold cyan]Planning...[/bold cyan]"):
                         plan = create_plan(session, query)
                 except Exception as exc2:
-                    if _is_auth_error(exc2):
+                    if is_auth_error(exc2):
                         # Show help and exit
                         _handle_auth_error(session, prompt=False)
                         raise typer.Exit(code=1)
@@ -613,24 +641,25 @@ def _run_single_query(session: Session, query: str, verbose: bool):
         results = execute_plan(session, plan, verbose=verbose)
 
     console.print()
+    # Chunks arrive already coalesced (see CoalescingBuffer); one write+flush each
+    stdout = sys.stdout
+    write, flush = stdout.write, stdout.flush
     for chunk in synthesize_streaming(session, query, plan, results):
-        print(chunk, end="", flush=True)
-    print()
+        write(chunk)
+        flush()
+    write("\n")
 
     # Show usage
     llm = session.get_llm()
-    if llm.usage.calls:
+    if llm.usage.call_count:
         console.print(f"\n  [dim]{llm.usage.summary()}[/dim]")
 
 
-def _run_interactive(session: Session):
+def _run_interactive(session: "Session"):
     """Launch interactive terminal."""
-    console.print(BANNER)
-    console.print(
-        f"  [bold]TCM CLI[/bold] v{__version__} | "
-        f"model: [cyan]{session.current_model}[/cyan] | "
-        f"tools: [green]{_count_tools()}[/green]"
-    )
+    if console.is_terminal:
+        console.print(BANNER)
+    console.print(_STATUS_TEMPLATE.format(model=session.current_model, tools=_count_tools()))
     console.print(
         "  Type your research question, /help for commands, /exit to quit."
     )
@@ -640,23 +669,53 @@ def _run_interactive(session: Session):
     terminal.run()
 
 
+@functools.lru_cache(maxsize=1)
+def _loaded_tool_count() -> int:
+    """Load the tool registry and count it (tool modules are fixed for the process)."""
+    from tcm.tools import registry, ensure_loaded
+    ensure_loaded()
+    return len(registry)
+
+
 def _count_tools() -> int:
-    """Count available tools."""
+    """Count available tools; a failed load is not cached, so it is retried next time."""
     try:
-        from tcm.tools import registry, ensure_loaded
-        ensure_loaded()
-        return len(registry.list_tools())
+        return _loaded_tool_count()
     except Exception:
         return 0
 
 
-def _is_auth_error(exc: Exception) -> bool:
-    """Check if an exception is an authentication error."""
-    err = str(exc).lower()
-    return "authentication" in err or "401" in err or "invalid x-api-key" in err or "invalid api key" in err
+# Manual-fix guidance shown after an auth failure (Rich markup, parsed once in _auth_help)
+_AUTH_HELP = {
+    "anthropic": (
+        "  To fix, run one of:\n"
+        "    [cyan]tcm config set llm.api_key YOUR_KEY[/cyan]\n"
+        "    [cyan]export ANTHROPIC_API_KEY=YOUR_KEY[/cyan]\n"
+        "  Get a key at: [link=https://console.anthropic.com/settings/keys]console.anthropic.com/settings/keys[/link]"
+    ),
+    "openai": (
+        "  To fix, run one of:\n"
+        "    [cyan]tcm config set llm.openai_api_key YOUR_KEY[/cyan]\n"
+        "    [cyan]export OPENAI_API_KEY=YOUR_KEY[/cyan]\n"
+        "  Get a key at: [link=https://platform.openai.com/api-keys]platform.openai.com/api-keys[/link]"
+    ),
+}
+_AUTH_HELP_OTHER = (
+    "  To fix, run:\n"
+    "    [cyan]tcm keys set -p {provider} --api-key YOUR_KEY[/cyan]\n"
+    "  Or set the provider-specific environment variable (see `tcm keys show`)."
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _auth_help(provider: str):
+    """Prebuilt guidance renderable for ``provider``."""
+    from rich.text import Text
+
+    return Text.from_markup(_AUTH_HELP.get(provider) or _AUTH_HELP_OTHER.format(provider=provider))
 
 
-def _handle_auth_error(session: Session, prompt: bool = True) -> bool:
+def _handle_auth_error(session: "Session", prompt: bool = True) -> bool:
     """Handle authentication failure.
 
     If prompt is True, offer to capture and save the API key interactively.
@@ -665,23 +724,18 @@ def _handle_auth_error(session: Session, prompt: bool = True) -> bool:
     provider = session.config.get("llm.provider", "anthropic")
     console.print()
     console.print(f"  [red]Authentication failed[/red] for provider [bold]{provider}[/bold].")
-    console.print("  Your API key is missing or invalid.")
+    console.print("  Your API key is missing or invalid.", markup=False, highlight=False)
     console.print()
 
     if prompt:
         try:
-            choice = input("  Enter a new API key now? [y/N] ").strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n  [dim]Cancelled.[/dim]")
+            update = _prompt("  Enter a new API key now? [y/N] ").lower() in ("y", "yes")
+            if update:
+                label = _config().PROVIDER_SPECS.get(provider, {}).get("label", provider.title())
+                new_key = _prompt(f"  Enter your {label} API key: ", secret=True)
+        except typer.Exit:  # cancelled at a prompt
             return False
-        if choice in ("y", "yes"):
-            from tcm.agent.config import PROVIDER_SPECS
-            label = PROVIDER_SPECS.get(provider, {}).get("label", provider.title())
-            try:
-                new_key = getpass.getpass(f"  Enter your {label} API key: ").strip()
-            except (EOFError, KeyboardInterrupt):
-                console.print("\n  [dim]Cancelled.[/dim]")
-                return False
+        if update:
             try:
                 session.config.set_llm_api_key(provider, new_key)
                 session.config.save()
@@ -694,20 +748,7 @@ def _handle_auth_error(session: Session, prompt: bool = True) -> bool:
                 return False
 
     # Guidance for manual setup
-    if provider == "anthropic":
-        console.print("  To fix, run one of:")
-        console.print('    [cyan]tcm config set llm.api_key YOUR_KEY[/cyan]')
-        console.print('    [cyan]export ANTHROPIC_API_KEY=YOUR_KEY[/cyan]')
-        console.print("  Get a key at: [link=https://console.anthropic.com/settings/keys]console.anthropic.com/settings/keys[/link]")
-    elif provider == "openai":
-        console.print("  To fix, run one of:")
-        console.print('    [cyan]tcm config set llm.openai_api_key YOUR_KEY[/cyan]')
-        console.print('    [cyan]export OPENAI_API_KEY=YOUR_KEY[/cyan]')
-        console.print("  Get a key at: [link=https://platform.openai.com/api-keys]platform.openai.com/api-keys[/link]")
-    else:
-        console.print("  To fix, run:")
-        console.print(f"    [cyan]tcm keys set -p {provider} --api-key YOUR_KEY[/cyan]")
-        console.print("  Or set the provider-specific environment variable (see `tcm keys show`).")
+    console.print(_auth_help(provider))
     console.print()
     return False
 
@@ -4,11 +4,30 @@ Unified LLM client: supports Anthropic and OpenAI.
 Provides a consistent interface regardless of backend.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, Generator
+from array import array
+from dataclasses import dataclass
+from typing import AsyncGenerator, Generator, Mapping, Optional
+import asyncio
+import atexit
+import copy
+import functools
+import hashlib
+import json
 import logging
+import operator
 import os
+import random
+import re
+import sys
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+try:
+    import orjson  # optional: faster JSON (pip install tcm-cli[fast])
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("tcm.llm")
 
@@ -25,7 +44,11 @@ class LLMResponse:
 
 # ─── Model catalog ────────────────────────────────────────────
 
-@dataclass
+# slots=True needs Python 3.10+; on 3.9 instances simply keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class ModelInfo:
     """Metadata for a supported LLM model."""
     id: str
@@ -37,12 +60,15 @@ class ModelInfo:
     description: str = ""
 
 
-MODEL_CATALOG: dict[str, ModelInfo] = {}
+_MODELS: dict[str, ModelInfo] = {}
+
+# Read-only view of the registered models, keyed by id
+MODEL_CATALOG: Mapping[str, ModelInfo] = MappingProxyType(_MODELS)
 
 
 def _register(*models: ModelInfo):
     for m in models:
-        MODEL_CATALOG[m.id] = m
+        _MODELS[m.id] = m
 
 
 _register(
@@ -283,6 +309,15 @@ _register(
     ),
 )
 
+# Catalog model IDs, for cheap membership checks
+MODEL_IDS: frozenset[str] = frozenset(MODEL_CATALOG)
+
+# Catalog models grouped by provider, in registration order
+_BY_PROVIDER: dict[str, tuple[ModelInfo, ...]] = {}
+for _m in MODEL_CATALOG.values():
+    _BY_PROVIDER[_m.provider] = _BY_PROVIDER.get(_m.provider, ()) + (_m,)
+del _m
+
 # Provider prefix patterns for auto-detection of unknown models
 _PROVIDER_PREFIXES = [
     ("claude-", "anthropic"),
@@ -298,6 +333,20 @@ _PROVIDER_PREFIXES = [
 ]
 
 
+@functools.lru_cache(maxsize=None)
+def _provider_pattern() -> "re.Pattern[str]":
+    # One alternation over all prefixes, tried in list order like the old scan
+    return re.compile("|".join(re.escape(prefix) for prefix, _ in _PROVIDER_PREFIXES))
+
+
+@functools.lru_cache(maxsize=None)
+def _prefix_providers() -> dict[str, str]:
+    providers: dict[str, str] = {}
+    for prefix, provider in _PROVIDER_PREFIXES:
+        providers.setdefault(prefix, provider)
+    return providers
+
+
 def resolve_provider(model: str) -> Optional[str]:
     """Resolve the provider for a model name.
 
@@ -307,19 +356,23 @@ def resolve_provider(model: str) -> Optional[str]:
     info = MODEL_CATALOG.get(model)
     if info:
         return info.provider
-    model_lower = model.lower()
-    for prefix, provider in _PROVIDER_PREFIXES:
-        if model_lower.startswith(prefix):
-            return provider
-    return None
+    m = _provider_pattern().match(model.lower())
+    if m is None:
+        return None
+    return _prefix_providers()[m.group()]
 
 
 def list_models(provider: str = None) -> list[ModelInfo]:
     """List models from the catalog, optionally filtered by provider."""
-    models = list(MODEL_CATALOG.values())
     if provider:
-        models = [m for m in models if m.provider == provider]
-    return models
+        return list(_BY_PROVIDER.get(provider, ()))
+    return list(MODEL_CATALOG.values())
+
+
+_GOOGLE_MODEL_FIELDS = operator.attrgetter(
+    "name", "display_name", "description",
+    "input_token_limit", "output_token_limit", "supported_actions",
+)
 
 
 def list_google_models(api_key: str = None) -> list[dict]:
@@ -339,18 +392,26 @@ def list_google_models(api_key: str = None) -> list[dict]:
     client = genai_sdk.Client(api_key=key)
     result = []
     for m in client.models.list():
-        name = getattr(m, "name", "") or ""
-        methods = list(getattr(m, "supported_actions", None) or [])
+        try:
+            name, display_name, description, in_limit, out_limit, actions = _GOOGLE_MODEL_FIELDS(m)
+        except AttributeError:  # older SDK objects may lack some fields
+            name = getattr(m, "name", "")
+            display_name = getattr(m, "display_name", None)
+            description = getattr(m, "description", "")
+            in_limit = getattr(m, "input_token_limit", None)
+            out_limit = getattr(m, "output_token_limit", None)
+            actions = getattr(m, "supported_actions", None)
+        name = name or ""
         # Prefer short id without "models/" prefix
         short_id = name.replace("models/", "")
         result.append({
             "id": short_id,
             "name": name,
-            "display_name": getattr(m, "display_name", short_id),
-            "description": getattr(m, "description", ""),
-            "input_token_limit": getattr(m, "input_token_limit", None),
-            "output_token_limit": getattr(m, "output_token_limit", None),
-            "methods": methods,
+            "display_name": display_name if display_name is not None else short_id,
+            "description": description,
+            "input_token_limit": in_limit,
+            "output_token_limit": out_limit,
+            "methods": list(actions or []),
         })
     # Sort: generateContent-capable first, then alpha
     result.sort(key=lambda x: ("generateContent" not in str(x["methods"]), x["id"]))
@@ -359,67 +420,283 @@ def list_google_models(api_key: str = None) -> list[dict]:
 
 def model_pricing(model: str) -> Optional[dict]:
     """Get pricing info for a model. Returns {input, output} or None."""
+    rates = _model_rates(model)
+    if rates:
+        return {"input": rates[0], "output": rates[1]}
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _model_rates(model: str) -> Optional[tuple[float, float]]:
+    # (input, output) USD per million tokens; the catalog is fixed after import
     info = MODEL_CATALOG.get(model)
     if info:
-        return {"input": info.input_price, "output": info.output_price}
+        return (info.input_price, info.output_price)
     return None
 
 
-@dataclass
 class UsageTracker:
-    """Tracks cumulative token usage and cost across LLM calls."""
-    calls: list = field(default_factory=list)
+    """Tracks cumulative token usage and cost across LLM calls.
+
+    Per-call figures live in parallel typed arrays and the totals are kept
+    as running sums, so the aggregate properties don't rescan the history.
+    """
+
+    __slots__ = ("_models", "_input", "_output", "_cost", "_sum_in", "_sum_out", "_sum_cost",
+                 "_lock")
+
+    def __init__(self):
+        # chat_many() records from worker threads; the running sums are read-modify-write
+        self._lock = threading.Lock()
+        self._models: list[str] = []
+        self._input = array("q")
+        self._output = array("q")
+        self._cost = array("d")
+        self._sum_in = 0
+        self._sum_out = 0
+        self._sum_cost = 0.0
+
+    @property
+    def calls(self) -> list[dict]:
+        """Per-call records, materialized on demand."""
+        return [
+            {"model": m, "input": i, "output": o, "cost": c}
+            for m, i, o, c in zip(self._models, self._input, self._output, self._cost)
+        ]
+
+    @property
+    def call_count(self) -> int:
+        return len(self._models)
 
     @property
     def total_input_tokens(self) -> int:
-        return sum(c.get("input", 0) for c in self.calls)
+        return self._sum_in
 
     @property
     def total_output_tokens(self) -> int:
-        return sum(c.get("output", 0) for c in self.calls)
+        return self._sum_out
 
     @property
     def total_tokens(self) -> int:
-        return self.total_input_tokens + self.total_output_tokens
+        return self._sum_in + self._sum_out
 
     @property
     def total_cost(self) -> float:
-        return sum(c.get("cost", 0.0) for c in self.calls)
+        return self._sum_cost
 
     def record(self, model: str, usage: dict):
         """Record a single LLM call's usage."""
         if not usage:
             return
+        n_in = int(usage.get("input", 0) or 0)
+        n_out = int(usage.get("output", 0) or 0)
         cost = self._estimate_cost(model, usage)
-        self.calls.append({
-            "model": model,
-            "input": usage.get("input", 0),
-            "output": usage.get("output", 0),
-            "cost": cost,
-        })
+        with self._lock:
+            self._models.append(model)
+            self._input.append(n_in)
+            self._output.append(n_out)
+            self._cost.append(cost)
+            self._sum_in += n_in
+            self._sum_out += n_out
+            self._sum_cost += cost
 
     def _estimate_cost(self, model: str, usage: dict) -> float:
-        pricing = model_pricing(model)
-        if not pricing:
+        rates = _model_rates(model)
+        if not rates:
             return 0.0
-        input_cost = (usage.get("input", 0) / 1_000_000) * pricing["input"]
-        output_cost = (usage.get("output", 0) / 1_000_000) * pricing["output"]
-        return input_cost + output_cost
+        return (usage.get("input", 0) * rates[0] + usage.get("output", 0) * rates[1]) / 1_000_000
 
     def summary(self) -> str:
         """Human-readable usage summary."""
-        if not self.calls:
+        if not self._models:
             return "No LLM calls made."
-        models_used = set(c["model"] for c in self.calls)
+        models_used = dict.fromkeys(self._models)
         return (
-            f"{len(self.calls)} LLM calls | "
+            f"{len(self._models)} LLM calls | "
             f"{self.total_input_tokens:,} in + {self.total_output_tokens:,} out tokens | "
             f"${self.total_cost:.4f} | "
             f"models: {', '.join(models_used)}"
         )
 
     def reset(self):
-        self.calls.clear()
+        with self._lock:
+            self._models.clear()
+            del self._input[:], self._output[:], self._cost[:]
+            self._sum_in = self._sum_out = 0
+            self._sum_cost = 0.0
+
+
+class ResponseCache:
+    """Content-addressed cache of chat responses.
+
+    Keeps an in-memory LRU and, when ``path`` is given, a SQLite table so
+    answers survive across sessions. Only the text, model and usage are
+    persisted; SDK objects (``raw``, tool-use blocks) stay in memory.
+    """
+
+    def __init__(self, max_entries: int = 128, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self._mem: OrderedDict[bytes, LLMResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            import sqlite3
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key BLOB PRIMARY KEY, payload BLOB, created REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(provider: str, model: str, system: str, messages: list[dict],
+            temperature: float, max_tokens: int, tools) -> bytes:
+        """Digest of a request's canonical JSON form."""
+        payload = _dumps_bytes(
+            [provider, model, system, messages, temperature, max_tokens, tools],
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[LLMResponse]:
+        with self._lock:
+            resp = self._mem.get(key)
+            if resp is not None:
+                self._mem.move_to_end(key)
+                return resp
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = _loads(row[0])
+        resp = LLMResponse(content=data["content"], model=data["model"], usage=data["usage"])
+        self._remember(key, resp)
+        return resp
+
+    def set(self, key: bytes, resp: LLMResponse, persist: bool = True):
+        resp = LLMResponse(content=resp.content, model=resp.model, usage=resp.usage,
+                           content_blocks=resp.content_blocks)
+        self._remember(key, resp)
+        if self._db is None or not persist:
+            return
+        payload = _dumps_bytes({"content": resp.content, "model": resp.model, "usage": resp.usage})
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            self._db.commit()
+
+    def _remember(self, key: bytes, resp: LLMResponse):
+        with self._lock:
+            self._mem[key] = resp
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_http_client(sdk):
+    """Process-wide pooled HTTP client for one provider SDK module.
+
+    Clients rebuilt on a model or key switch (and every OpenAI-compatible
+    provider) reuse warm connections instead of paying a fresh TLS
+    handshake. Built from the SDK's own DefaultHttpxClient so timeouts,
+    limits and the bundled httpx flavour match what the SDK expects.
+    """
+    factory = getattr(sdk, "DefaultHttpxClient", None)
+    if factory is None:  # older SDKs: each client builds its own
+        return None
+    client = factory()
+    atexit.register(client.close)
+    return client
+
+
+def _dumps_bytes(obj, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON; orjson when installed, else the stdlib."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str,
+                                option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            pass  # e.g. non-str keys; the stdlib copes
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"),
+                      ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _system_message(system: str) -> dict:
+    # Agent loops resend the same system prompt; share its (read-only) message dict
+    return {"role": "system", "content": system}
+
+
+def _join_text_blocks(blocks) -> str:
+    """Join the non-empty text of Anthropic content blocks (tool_use blocks have none)."""
+    return "\n".join(b.text for b in (blocks or ()) if getattr(b, "text", None))
+
+
+def _google_contents(genai_types, system: str, messages: list[dict]) -> list:
+    """Build Gemini ``contents``; the system prompt becomes a leading user/model exchange."""
+    contents = [
+        genai_types.Content(
+            role="model" if m.get("role", "user") == "assistant" else "user",
+            parts=[genai_types.Part(text=m.get("content", ""))],
+        )
+        for m in messages
+    ]
+    if system:
+        contents[:0] = (
+            genai_types.Content(
+                role="user",
+                parts=[genai_types.Part(text=f"[System instructions]\n{system}")],
+            ),
+            genai_types.Content(
+                role="model",
+                parts=[genai_types.Part(text="Understood. I will follow those instructions.")],
+            ),
+        )
+    return contents
+
+
+# SDK exception classes (Anthropic and OpenAI share these names) that are
+# always worth retrying; matched by name so neither SDK has to be imported.
+_TRANSIENT_ERROR_TYPES = frozenset({
+    "RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError",
+})
+
+# Error text markers for rate limits, overload, 5xx and network failures
+_TRANSIENT_ERROR_RE = re.compile(
+    r"rate[_ ]limit|overloaded|connection|timeout|\b(?:429|500|502|503|529)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_transient_error(exc: Exception) -> bool:
+    """True for errors a retry may fix: throttling, overload, 5xx, network."""
+    if any(cls.__name__ in _TRANSIENT_ERROR_TYPES for cls in type(exc).__mro__):
+        return True
+    return _TRANSIENT_ERROR_RE.search(str(exc)) is not None
+
+
+def _estimate_tokens(system: str, messages: list[dict]) -> int:
+    """Rough prompt size for routing: about four characters per token."""
+    chars = len(system or "") + sum(len(str(m.get("content", ""))) for m in messages)
+    return chars // 4
+
+
+# Weight of the newest sample in the per-model latency average
+_LATENCY_EWMA_ALPHA = 0.2
+
+# Requests at or above this temperature are sampled, so never served from cache
+_CACHE_MAX_TEMPERATURE = 0.2
 
 
 class LLMClient:
@@ -439,13 +716,21 @@ class LLMClient:
     }
 
     def __init__(self, provider: str = "anthropic", model: str = None,
-                 api_key: str = None, base_url: str | None = None):
+                 api_key: str = None, base_url: str | None = None,
+                 cache: Optional[ResponseCache] = None):
         self.provider = provider
         self.model = model or self.DEFAULT_MODELS.get(provider)
         self.api_key = api_key
         self.base_url = base_url
+        self.cache = cache
         self._client = None
         self.usage = UsageTracker()
+        # Smoothed chat() latency in seconds per model id, used by route()
+        self.latency: dict[str, float] = {}
+
+    def warmup(self):
+        """Eagerly import and construct the provider SDK client."""
+        self._get_client()
 
     def _get_client(self):
         """Lazily initialize the appropriate client."""
@@ -455,7 +740,8 @@ class LLMClient:
         if self.provider == "anthropic":
             import anthropic
             self._client = anthropic.Anthropic(
-                api_key=self.api_key or os.environ.get("ANTHROPIC_API_KEY")
+                api_key=self.api_key or os.environ.get("ANTHROPIC_API_KEY"),
+                http_client=_shared_http_client(anthropic),
             )
         elif self.provider in {"openai", "deepseek", "kimi", "minimax", "qwen", "mistral", "groq"}:
             import openai
@@ -484,9 +770,10 @@ class LLMClient:
             }
             base_url = self.base_url if self.base_url is not None else base_urls.get(self.provider)
             if base_url:
-                self._client = openai.OpenAI(api_key=key, base_url=base_url)
+                self._client = openai.OpenAI(api_key=key, base_url=base_url,
+                                             http_client=_shared_http_client(openai))
             else:
-                self._client = openai.OpenAI(api_key=key)
+                self._client = openai.OpenAI(api_key=key, http_client=_shared_http_client(openai))
         elif self.provider == "google":
             from google import genai as genai_sdk
             key = self.api_key or os.environ.get("GOOGLE_API_KEY")
@@ -501,10 +788,36 @@ class LLMClient:
         return self._client
 
     def chat(self, system: str, messages: list[dict], temperature: float = 0.1,
-             max_tokens: int = 4096, tools: list[dict] | None = None) -> LLMResponse:
-        """Send a chat completion request."""
+             max_tokens: int = 4096, tools: list[dict] | None = None,
+             route: Optional[str] = None) -> LLMResponse:
+        """Send a chat completion request.
+
+        Near-deterministic requests (temperature < 0.2) are answered from
+        ``self.cache`` when an identical request was seen before. With
+        ``route`` set to a tier ("cheap", "fast", "reasoning"), the model for
+        this call is chosen by route() instead of using ``self.model``.
+        """
+        if route is not None:
+            model = self.route(route, _estimate_tokens(system, messages), max_tokens)
+            if model != self.model:
+                # Build the SDK client first so the shallow copy shares it
+                # (along with the usage tracker and cache) instead of making its own
+                self._get_client()
+                routed = copy.copy(self)
+                routed.model = model
+                return routed.chat(system, messages, temperature, max_tokens, tools)
+
+        key = None
+        if self.cache is not None and temperature < _CACHE_MAX_TEMPERATURE:
+            key = ResponseCache.key(self.provider, self.model, system, messages,
+                                    temperature, max_tokens, tools)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         client = self._get_client()
 
+        started = time.monotonic()
         if self.provider == "anthropic":
             resp = self._chat_anthropic(client, system, messages, temperature, max_tokens, tools)
         elif self.provider in {"openai", "deepseek", "kimi", "minimax", "qwen", "mistral", "groq"}:
@@ -516,11 +829,65 @@ class LLMClient:
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
 
+        elapsed = time.monotonic() - started
+        prev = self.latency.get(self.model)
+        self.latency[self.model] = elapsed if prev is None else (
+            prev + _LATENCY_EWMA_ALPHA * (elapsed - prev)
+        )
         if resp.usage:
             self.usage.record(resp.model, resp.usage)
+        if key is not None:
+            # Tool-use blocks can't be rebuilt from disk, so keep those in memory only
+            self.cache.set(key, resp, persist=not tools)
 
         return resp
 
+    def route(self, tier: str, prompt_tokens: int = 0, max_tokens: int = 4096,
+              candidates: Optional[list[str]] = None,
+              max_latency_s: Optional[float] = None) -> str:
+        """Pick a model id for a task tier.
+
+        "cheap" picks the lowest expected cost, "fast" the lowest observed
+        latency (cost breaks ties), and "reasoning" keeps the configured
+        model. Candidates default to this provider's catalog models, since
+        the client can only reach one provider. Models must fit the request
+        in their context window and have known prices. A model with no
+        latency sample yet counts as 0 s, both for ``max_latency_s`` and for
+        ranking, so untried models get measured. Falls back to
+        ``self.model`` when nothing qualifies.
+        """
+        if tier == "reasoning":
+            return self.model
+        if tier not in ("cheap", "fast"):
+            raise ValueError(f"Unknown routing tier: {tier}")
+
+        if candidates is None:
+            pool = _BY_PROVIDER.get(self.provider, ())
+        else:
+            pool = [MODEL_CATALOG[m] for m in candidates if m in MODEL_CATALOG]
+        need = prompt_tokens + max_tokens
+        observed = self.latency
+
+        def latency(m):
+            return observed.get(m.id, 0.0)
+
+        def cost(m):
+            return m.input_price * prompt_tokens + m.output_price * max_tokens
+
+        pool = [
+            m for m in pool
+            if m.context_window >= need and (m.input_price or m.output_price)
+            and (max_latency_s is None or latency(m) <= max_latency_s)
+        ]
+        if not pool:
+            return self.model
+
+        if tier == "cheap":
+            best = min(pool, key=lambda m: (cost(m), latency(m)))
+        else:
+            best = min(pool, key=lambda m: (latency(m), cost(m)))
+        return best.id
+
     def stream(self, system: str, messages: list[dict], temperature: float = 0.1,
                max_tokens: int = 4096) -> Generator[str, None, None]:
         """Stream a chat completion, yielding text chunks."""
@@ -539,19 +906,195 @@ class LLMClient:
             resp = self.chat(system, messages, temperature, max_tokens)
             yield resp.content
 
+    def stream_bytes(self, system: str, messages: list[dict], temperature: float = 0.1,
+                     max_tokens: int = 4096, accumulate: bool = False):
+        """Stream a chat completion as UTF-8 bytes, ready for a binary sink.
+
+        With ``accumulate``, the text is collected in one bytearray and each
+        chunk is a memoryview into it; a view is only valid until the next
+        iteration, so write or copy it before asking for more. The complete
+        body is the generator's return value (``body = yield from ...``).
+        """
+        chunks = self.stream(system, messages, temperature, max_tokens)
+        if not accumulate:
+            for text in chunks:
+                yield text.encode("utf-8")
+            return None
+
+        buf = bytearray()
+        for text in chunks:
+            start = len(buf)
+            buf += text.encode("utf-8")
+            with memoryview(buf) as whole:
+                view = whole[start:]
+                try:
+                    yield view
+                finally:
+                    view.release()  # lets the bytearray grow again
+        return bytes(buf)
+
+    async def astream(self, system: str, messages: list[dict], temperature: float = 0.1,
+                      max_tokens: int = 4096) -> AsyncGenerator[str, None]:
+        """Async variant of stream().
+
+        The provider SDK stream runs on a worker thread, one chunk per hop, so
+        several streams can overlap on a single event loop.
+        """
+        loop = asyncio.get_running_loop()
+        it = self.stream(system, messages, temperature, max_tokens)
+        done = object()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, it, done)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            it.close()
+
+    async def chat_many(self, jobs: list[dict], *, max_concurrency: int = 10,
+                        rpm: Optional[int] = None,
+                        use_batch_api: bool = False) -> list[LLMResponse]:
+        """Run many chat() requests, returning responses in job order.
+
+        Each job is a dict of chat() keyword arguments (system, messages,
+        temperature, max_tokens). With ``use_batch_api`` and an OpenAI or
+        Anthropic client, jobs go through the provider's batch endpoint
+        (cheaper, but may take minutes); jobs the batch could not answer are
+        re-sent individually. Otherwise up to ``max_concurrency`` requests
+        run at once on worker threads, started no faster than ``rpm`` per
+        minute when given.
+        """
+        responses: list[Optional[LLMResponse]] = [None] * len(jobs)
+        if use_batch_api and jobs:
+            if self.provider == "openai":
+                await self._batch_openai(jobs, responses)
+            elif self.provider == "anthropic":
+                await self._batch_anthropic(jobs, responses)
+
+        pending = [i for i, resp in enumerate(responses) if resp is None]
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+        interval = 60.0 / rpm if rpm else 0.0
+        pace = asyncio.Lock()
+        next_start = [0.0]
+
+        async def run(i):
+            async with sem:
+                if interval:
+                    async with pace:
+                        now = time.monotonic()
+                        delay = next_start[0] - now
+                        next_start[0] = max(now, next_start[0]) + interval
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                responses[i] = await asyncio.to_thread(functools.partial(self.chat, **jobs[i]))
+
+        await asyncio.gather(*(run(i) for i in pending))
+        return responses
+
+    async def _poll_batch(self, retrieve, done, max_delay: float = 60.0):
+        """Poll a provider batch with exponential backoff until ``done(batch)``."""
+        delay = 2.0
+        while True:
+            batch = await asyncio.to_thread(retrieve)
+            if done(batch):
+                return batch
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    async def _batch_openai(self, jobs: list[dict], responses: list):
+        client = self._get_client()
+        lines = []
+        for i, job in enumerate(jobs):
+            body = {
+                "model": self.model,
+                "messages": [_system_message(job.get("system", "")), *job["messages"]],
+                "temperature": job.get("temperature", 0.1),
+                "max_tokens": job.get("max_tokens", 4096),
+            }
+            lines.append(_dumps_bytes({
+                "custom_id": str(i), "method": "POST",
+                "url": "/v1/chat/completions", "body": body,
+            }))
+        payload = b"\n".join(lines) + b"\n"
+
+        upload = await asyncio.to_thread(
+            client.files.create, file=("batch.jsonl", payload), purpose="batch",
+        )
+        created = await asyncio.to_thread(
+            client.batches.create, input_file_id=upload.id,
+            endpoint="/v1/chat/completions", completion_window="24h",
+        )
+        batch = await self._poll_batch(
+            lambda: client.batches.retrieve(created.id),
+            lambda b: b.status in ("completed", "failed", "expired", "cancelled"),
+        )
+        if not batch.output_file_id:
+            logger.warning("OpenAI batch %s ended with status %s", batch.id, batch.status)
+            return
+        content = await asyncio.to_thread(client.files.content, batch.output_file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            row = _loads(line)
+            resp = row.get("response") or {}
+            if resp.get("status_code") != 200:
+                continue
+            body = resp["body"]
+            usage = body.get("usage") or {}
+            usage_data = {
+                "input": usage.get("prompt_tokens", 0),
+                "output": usage.get("completion_tokens", 0),
+            }
+            responses[int(row["custom_id"])] = LLMResponse(
+                content=body["choices"][0]["message"].get("content") or "",
+                model=self.model,
+                usage=usage_data,
+                raw=body,
+            )
+            self.usage.record(self.model, usage_data)
+
+    async def _batch_anthropic(self, jobs: list[dict], responses: list):
+        client = self._get_client()
+        requests = [
+            {"custom_id": str(i), "params": {
+                "model": self.model,
+                "system": job.get("system", ""),
+                "messages": job["messages"],
+                "temperature": job.get("temperature", 0.1),
+                "max_tokens": job.get("max_tokens", 4096),
+            }}
+            for i, job in enumerate(jobs)
+        ]
+        batch = await asyncio.to_thread(client.messages.batches.create, requests=requests)
+        await self._poll_batch(
+            lambda: client.messages.batches.retrieve(batch.id),
+            lambda b: b.processing_status == "ended",
+        )
+        results = await asyncio.to_thread(lambda: list(client.messages.batches.results(batch.id)))
+        for entry in results:
+            if entry.result.type != "succeeded":
+                continue
+            message = entry.result.message
+            usage = {"input": message.usage.input_tokens, "output": message.usage.output_tokens}
+            responses[int(entry.custom_id)] = LLMResponse(
+                content=_join_text_blocks(message.content),
+                model=self.model,
+                usage=usage,
+                raw=message,
+                content_blocks=list(message.content),
+            )
+            self.usage.record(self.model, usage)
+
     def _retry(self, fn, max_retries: int = 3, base_delay: float = 2.0):
-        """Retry with exponential backoff on transient errors."""
+        """Retry with jittered exponential backoff on transient errors."""
         for attempt in range(1, max_retries + 1):
             try:
                 return fn()
             except Exception as e:
-                err_str = str(e).lower()
-                is_transient = any(w in err_str for w in (
-                    "rate_limit", "rate limit", "429", "overloaded",
-                    "529", "500", "502", "503", "connection", "timeout",
-                ))
-                if is_transient and attempt < max_retries:
-                    delay = base_delay * (2 ** (attempt - 1))
+                if _is_transient_error(e) and attempt < max_retries:
+                    # Jitter spreads out concurrent calls that were throttled together
+                    delay = base_delay * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
                     logger.warning(
                         "LLM call failed (attempt %d/%d): %s — retrying in %.1fs",
                         attempt, max_retries, e, delay,
@@ -576,13 +1119,8 @@ class LLMClient:
         if tools:
             kwargs["tools"] = tools
         response = client.messages.create(**kwargs)
-        if not response.content:
-            content_text = ""
-        else:
-            text_parts = [b.text for b in response.content if hasattr(b, "text")]
-            content_text = "\n".join(text_parts) if text_parts else ""
         return LLMResponse(
-            content=content_text,
+            content=_join_text_blocks(response.content),
             model=self.model,
             usage={"input": response.usage.input_tokens, "output": response.usage.output_tokens},
             raw=response,
@@ -624,24 +1162,7 @@ class LLMClient:
 
     def _call_google(self, client, system, messages, temperature, max_tokens):
         from google.genai import types as genai_types
-        # Build contents list
-        contents = []
-        if system:
-            contents.append(genai_types.Content(
-                role="user",
-                parts=[genai_types.Part(text=f"[System instructions]\n{system}")],
-            ))
-            contents.append(genai_types.Content(
-                role="model",
-                parts=[genai_types.Part(text="Understood. I will follow those instructions.")],
-            ))
-        for m in messages:
-            role = m.get("role", "user")
-            api_role = "model" if role == "assistant" else "user"
-            contents.append(genai_types.Content(
-                role=api_role,
-                parts=[genai_types.Part(text=m.get("content", ""))],
-            ))
+        contents = _google_contents(genai_types, system, messages)
         config = genai_types.GenerateContentConfig(
             temperature=float(temperature),
             max_output_tokens=int(max_tokens),
@@ -652,34 +1173,19 @@ class LLMClient:
             config=config,
         )
         text = response.text or ""
-        usage = None
-        meta = getattr(response, "usage_metadata", None)
-        if meta:
+        try:
+            meta = response.usage_metadata
             usage = {
-                "input": getattr(meta, "prompt_token_count", 0),
-                "output": getattr(meta, "candidates_token_count", 0),
-            }
+                "input": meta.prompt_token_count,
+                "output": meta.candidates_token_count,
+            } if meta else None
+        except AttributeError:
+            usage = None
         return LLMResponse(content=text, model=self.model, usage=usage, raw=response)
 
     def _stream_google(self, client, system, messages, temperature, max_tokens):
         from google.genai import types as genai_types
-        contents = []
-        if system:
-            contents.append(genai_types.Content(
-                role="user",
-                parts=[genai_types.Part(text=f"[System instructions]\n{system}")],
-            ))
-            contents.append(genai_types.Content(
-                role="model",
-                parts=[genai_types.Part(text="Understood. I will follow those instructions.")],
-            ))
-        for m in messages:
-            role = m.get("role", "user")
-            api_role = "model" if role == "assistant" else "user"
-            contents.append(genai_types.Content(
-                role=api_role,
-                parts=[genai_types.Part(text=m.get("content", ""))],
-            ))
+        contents = _google_contents(genai_types, system, messages)
         config = genai_types.GenerateContentConfig(
             temperature=float(temperature),
             max_output_tokens=int(max_tokens),
@@ -699,11 +1205,9 @@ class LLMClient:
         )
 
     def _call_cohere(self, client, system, messages, temperature, max_tokens):
-        parts = [f"[system]\n{system}"] if system else []
-        for m in messages:
-            role = m.get("role", "user")
-            content = m.get("content", "")
-            parts.append(f"[{role}]\n{content}")
+        parts = [f"[{m.get('role', 'user')}]\n{m.get('content', '')}" for m in messages]
+        if system:
+            parts.insert(0, f"[system]\n{system}")
         prompt = "\n\n".join(parts)
         resp = client.chat(
             model=self.model,
@@ -725,7 +1229,7 @@ class LLMClient:
         # Kimi (Moonshot) only accepts temperature=1 for some models
         if self.provider == "kimi":
             temperature = 1.0
-        oai_messages = [{"role": "system", "content": system}] + messages
+        oai_messages = [_system_message(system), *messages]
         response = client.chat.completions.create(
             model=self.model,
             messages=oai_messages,
@@ -751,7 +1255,7 @@ class LLMClient:
         # Normalize temperature for OpenAI-compatible providers
         if self.provider == "kimi":
             temperature = 1.0
-        oai_messages = [{"role": "system", "content": system}] + messages
+        oai_messages = [_system_message(system), *messages]
         stream = client.chat.completions.create(
             model=self.model,
             messages=oai_messages,
@@ -761,9 +1265,8 @@ class LLMClient:
         )
         for chunk in stream:
             try:
-                if getattr(chunk, "choices", None) and chunk.choices:
-                    delta = getattr(chunk.choices[0], "delta", None)
-                    if delta and getattr(delta, "content", None):
-                        yield delta.content
-            except Exception:
-                continue
+                content = chunk.choices[0].delta.content
+            except (AttributeError, IndexError, TypeError):
+                continue  # usage-only or keep-alive chunks carry no delta
+            if content:
+                yield content
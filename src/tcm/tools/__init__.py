@@ -52,6 +52,8 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        # Bumped on every registration so callers can key caches on it
+        self.version = 0
 
     def register(self, name: str, description: str, category: str,
                  parameters: dict = None, requires_data: list = None,
@@ -67,9 +69,13 @@ class ToolRegistry:
                 requires_data=requires_data or [],
                 usage_guide=usage_guide,
             )
+            self.version += 1
             return func
         return decorator
 
+    def __len__(self) -> int:
+        return len(self._tools)
+
     def get_tool(self, name: str) -> Optional[Tool]:
         """Look up a tool by name."""
         return self._tools.get(name)
@@ -0,0 +1,13 @@
+"""
+Error classification shared by the CLI and the interactive terminal.
+"""
+
+import re
+
+# Markers of a rejected or missing API key in provider error messages
+AUTH_ERROR_RE = re.compile(r"authentication|401|invalid\s+x-api-key|invalid\s+api\s+key", re.IGNORECASE)
+
+
+def is_auth_error(exc: Exception) -> bool:
+    """Check if an exception is an authentication error."""
+    return AUTH_ERROR_RE.search(str(exc)) is not None
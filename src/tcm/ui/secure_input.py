@@ -0,0 +1,71 @@
+"""
+Secret prompt that works with piped stdin.
+
+Unlike getpass, input is read from stdin (so keys can be piped in scripts)
+and Ctrl-C still raises KeyboardInterrupt while echo is disabled.
+"""
+
+import sys
+
+
+def secure_input(prompt: str) -> str:
+    """Prompt for a secret without echoing it when stdin is a terminal.
+
+    Raises EOFError when stdin is closed, matching input()/getpass.
+    """
+    stream = sys.stdin
+    if not stream.isatty():
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = stream.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+    if sys.platform == "win32":
+        return _read_windows(prompt)
+    return _read_posix(prompt, stream)
+
+
+def _read_posix(prompt: str, stream) -> str:
+    import termios
+
+    fd = stream.fileno()
+    old = termios.tcgetattr(fd)
+    new = termios.tcgetattr(fd)
+    new[3] &= ~termios.ECHO  # lflags; ISIG stays on so Ctrl-C still works
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    try:
+        termios.tcsetattr(fd, termios.TCSADRAIN, new)
+        line = stream.readline()
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    if not line:
+        raise EOFError
+    return line.rstrip("\r\n")
+
+
+def _read_windows(prompt: str) -> str:
+    import msvcrt
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    chars = []
+    while True:
+        ch = msvcrt.getwch()
+        if ch in ("\r", "\n"):
+            break
+        if ch == "\x03":
+            raise KeyboardInterrupt
+        if ch == "\x1a":
+            raise EOFError
+        if ch == "\b":
+            if chars:
+                chars.pop()
+            continue
+        chars.append(ch)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+    return "".join(chars)
@@ -6,7 +6,6 @@ Provides a REPL-style interface for continuous research sessions.
 """
 
 import random
-import re
 import sys
 
 from rich.console import Console
@@ -19,6 +18,7 @@ from prompt_toolkit.styles import Style
 from pathlib import Path
 
 from tcm.agent.config import CONFIG_DIR
+from tcm.ui.errors import is_auth_error
 
 # Slash commands
 SLASH_COMMANDS = {
@@ -239,7 +239,7 @@ class InteractiveTerminal:
 
     def _apply_model_choice(self, choice: str, models: list, current: str):
         """Apply a model selection by number or name."""
-        from tcm.models.llm import MODEL_CATALOG, resolve_provider
+        from tcm.models.llm import MODEL_IDS, resolve_provider
 
         # Try as number
         try:
@@ -263,7 +263,7 @@ class InteractiveTerminal:
         provider = resolve_provider(model_id)
         if provider:
             self.session.set_model(model_id)
-            in_catalog = model_id in MODEL_CATALOG
+            in_catalog = model_id in MODEL_IDS
             note = f"({provider})" if in_catalog else f"({provider}, not in catalog)"
             self.console.print(
                 f"  [green]Switched to[/green] [cyan]{model_id}[/cyan] [dim]{note}[/dim]"
@@ -287,14 +287,14 @@ class InteractiveTerminal:
             with self.console.status("[bold cyan]Planning research...[/bold cyan]"):
                 plan = create_plan(self.session, query)
         except Exception as exc:
-            if self._is_auth_error(exc):
+            if is_auth_error(exc):
                 if self._handle_auth_error():
                     # Retry once
                     try:
                         with self.console.status("[bold cyan]Planning research...[/bold cyan]"):
                             plan = create_plan(self.session, query)
                     except Exception as exc2:
-                        if self._is_auth_error(exc2):
+                        if is_auth_error(exc2):
                             self._handle_auth_error(prompt=False)
                             return
                         raise
@@ -322,10 +322,6 @@ class InteractiveTerminal:
         self._transcript.append(("assistant", self._last_answer))
         self.console.print()
 
-    def _is_auth_error(self, exc: Exception) -> bool:
-        err = str(exc).lower()
-        return "authentication" in err or "401" in err or "invalid x-api-key" in err or "invalid api key" in err
-
     def _handle_auth_error(self, prompt: bool = True) -> bool:
         """Handle auth error in interactive terminal. Returns True if updated."""
         provider = self.session.config.get("llm.provider", "anthropic")
@@ -342,8 +338,8 @@ class InteractiveTerminal:
                 from tcm.agent.config import PROVIDER_SPECS
                 label = PROVIDER_SPECS.get(provider, {}).get("label", provider.title())
                 try:
-                    import getpass
-                    new_key = getpass.getpass(f"  Enter your {label} API key: ").strip()
+                    from tcm.ui.secure_input import secure_input
+                    new_key = secure_input(f"  Enter your {label} API key: ").strip()
                 except (EOFError, KeyboardInterrupt):
                     self.console.print("\n  [dim]Cancelled.[/dim]")
                     return False
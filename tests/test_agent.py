@@ -0,0 +1,245 @@
+"""Tests for tcm.agent planner/executor helpers."""
+
+import pytest
+
+
+class TestPlanner:
+    def test_strip_json_fence(self):
+        from tcm.agent.planner import _strip_code_fence
+        text = 'Plan:\n```json\n{"steps": []}\n```\nDone.'
+        assert _strip_code_fence(text) == '{"steps": []}'
+
+    def test_strip_bare_fence(self):
+        from tcm.agent.planner import _strip_code_fence
+        assert _strip_code_fence('```\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_no_fence(self):
+        from tcm.agent.planner import _strip_code_fence
+        assert _strip_code_fence('{"a": 1}') == '{"a": 1}'
+
+
+class TestExecutor:
+    def test_resolve_step_reference(self):
+        from tcm.agent.executor import _resolve_params
+        previous = [{"output": {"targets": ["TNF", "IL6"]}}]
+        resolved = _resolve_params(
+            {"targets": "$step1.output.targets", "herb": "人参"}, previous,
+        )
+        assert resolved == {"targets": ["TNF", "IL6"], "herb": "人参"}
+
+    def test_resolve_unknown_reference_kept(self):
+        from tcm.agent.executor import _resolve_params
+        params = {"a": "$step3.output", "b": "$stepx", "c": "$step1.output.missing"}
+        resolved = _resolve_params(params, [{"output": {}}])
+        assert resolved == params
+
+    def test_execute_plan_runs_tools_in_order(self):
+        from tcm.agent.config import Config
+        from tcm.agent.executor import execute_plan
+        from tcm.agent.session import Session
+
+        plan = {"steps": [
+            {"tool": "herbs.lookup", "parameters": {"query": "人参"}, "purpose": "lookup"},
+            {"tool": "missing.tool", "parameters": {}},
+        ]}
+        results = execute_plan(Session(config=Config()), plan)
+        assert [r["step"] for r in results] == [1, 2]
+        assert results[0]["status"] == "success"
+        assert results[0]["output"]["status"] == "found"
+        assert results[1]["status"] == "error"
+
+    def test_bad_parameters_fail_only_their_step(self):
+        from tcm.agent.config import Config
+        from tcm.agent.executor import execute_plan
+        from tcm.agent.session import Session
+
+        plan = {"steps": [
+            {"tool": "herbs.lookup", "parameters": "人参"},
+            {"tool": "herbs.lookup", "parameters": ["人参"]},
+            {"tool": "herbs.lookup", "parameters": {"query": "人参"}},
+        ]}
+        results = execute_plan(Session(config=Config()), plan)
+        assert [r["status"] for r in results] == ["error", "error", "success"]
+        assert "expected an object" in results[0]["error"]
+
+    def test_retry_delay_is_bounded(self):
+        from tcm.agent.executor import _retry_delay
+        assert 0.125 <= _retry_delay(1) <= 0.25
+        assert 1.0 <= _retry_delay(10) <= 2.0
+
+
+class _FakeLLM:
+    model = "fake-model"
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    def warmup(self):
+        self.warmups = getattr(self, "warmups", 0) + 1
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        yield from self.chunks
+
+    async def astream(self, **kwargs):
+        for chunk in self.stream(**kwargs):
+            yield chunk
+
+
+def _fake_session(chunks):
+    from tcm.agent.config import Config
+    from tcm.agent.session import Session
+    session = Session(config=Config())
+    session._llm = _FakeLLM(chunks)
+    return session
+
+
+class TestSynthesizer:
+    RESULTS = [{"step": 1, "tool": "herbs.lookup", "status": "success", "output": {"a": 1}}]
+
+    def test_synthesize_joins_stream(self):
+        from tcm.agent.synthesizer import synthesize
+        session = _fake_session(["Gin", "seng"])
+        assert synthesize(session, "q", {"reasoning": "r"}, self.RESULTS) == "Ginseng"
+        assert len(session._llm.calls) == 1
+
+    def test_llm_direct_skips_llm(self, monkeypatch):
+        from tcm.agent.session import Session
+        from tcm.agent.synthesizer import synthesize
+        from tcm.agent.synthesizer import synthesize_streaming
+        session = _fake_session(["unused"])
+        session._llm = None
+        monkeypatch.setattr(Session, "_create_llm", lambda self: pytest.fail("LLM client must not be created"))
+        direct = [{"step": 0, "tool": "llm_direct", "result": "hi", "status": "success"}]
+        assert synthesize(session, "q", {}, direct) == "hi"
+        assert list(synthesize_streaming(session, "q", {}, direct)) == ["hi"]
+
+    def test_repeat_synthesis_is_cached(self):
+        from tcm.agent.synthesizer import synthesize
+        session = _fake_session(["answer"])
+        for _ in range(2):
+            assert synthesize(session, "q", {"reasoning": "r"}, self.RESULTS) == "answer"
+        assert len(session._llm.calls) == 1
+        assert session._llm.warmups == 1  # cache hits never touch the client
+        synthesize(session, "other question", {"reasoning": "r"}, self.RESULTS)
+        assert len(session._llm.calls) == 2
+
+    def test_async_syntheses_overlap(self):
+        import asyncio
+        from tcm.agent.synthesizer import synthesize_streaming_async
+
+        async def collect(session, query):
+            return "".join([c async for c in synthesize_streaming_async(
+                session, query, {"reasoning": "r"}, self.RESULTS)])
+
+        async def main():
+            return await asyncio.gather(
+                collect(_fake_session(["a", "b"]), "q1"),
+                collect(_fake_session(["c"]), "q2"),
+            )
+
+        assert asyncio.run(main()) == ["ab", "c"]
+
+    def test_single_markdown_result_skips_llm(self):
+        from tcm.agent.synthesizer import synthesize
+        session = _fake_session(["unused"])
+        session.config.set("agent.synthesis_skip_if_single", True)
+        doc = "## Ginseng\n" + "Details. " * 40
+        results = [{"step": 1, "tool": "t", "status": "success", "output": {"markdown": doc}}]
+        assert synthesize(session, "q", {}, results) == doc
+        assert session._llm.calls == []
+
+    def test_truncate_before_encoding(self):
+        from tcm.agent.synthesizer import _truncate_for_prompt
+        pruned = _truncate_for_prompt({"items": list(range(100_000)), "text": "x" * 2000}, max_chars=50)
+        assert len(pruned["items"]) < 20
+        assert pruned["items"][-1].startswith("... (truncated ")
+        assert pruned["..."] == "(truncated 1 more)"
+        assert _truncate_for_prompt({"text": "x" * 2000}, max_chars=50)["text"].endswith("... (truncated)")
+
+    def test_truncate_keeps_output_under_budget(self):
+        from tcm.agent.synthesizer import _truncate_for_prompt
+        record = {f"field_{i}": i for i in range(30)}
+        record["formulas"] = [{"name": f"formula {i}", "herbs": ["a", "b"]} for i in range(40)]
+        record["notes"] = "y" * 900
+        assert _truncate_for_prompt(record) == record
+
+    def test_truncated_render_matches_full_encoding(self):
+        from tcm.agent.synthesizer import _dumps_output, _render_result
+        output = {str(i): {"name": "人参" * (i % 7), "ids": list(range(i % 13))} for i in range(5000)}
+        full = _dumps_output(output)
+        text = _render_result({"step": 1, "tool": "t", "status": "success", "output": output})
+        assert full[:3000] + "\n... (truncated)" in text
+
+
+class TestCoalescingBuffer:
+    def test_first_chunk_flushes_immediately(self):
+        from tcm.agent.stream_buffer import CoalescingBuffer
+        out = list(CoalescingBuffer(max_chars=100, max_interval_s=60).wrap(["a", "b", "c"]))
+        assert out == ["a", "bc"]
+
+    def test_flushes_on_size(self):
+        from tcm.agent.stream_buffer import CoalescingBuffer
+        out = list(CoalescingBuffer(max_chars=2, max_interval_s=60).wrap(["a", "b", "c", "d", ""]))
+        assert out == ["a", "bc", "d"]
+
+    def test_format_results_compact_json(self):
+        from tcm.agent.synthesizer import _format_results
+        text = _format_results([
+            {"step": 1, "tool": "herbs.lookup", "status": "success", "output": {"herb": "人参"}},
+            {"step": 2, "tool": "x.y", "status": "error", "error": "boom"},
+        ])
+        assert '{"herb":' in text and "人参" in text
+        assert "✗ Error: boom" in text
+
+    def test_dumps_output_typed_values(self):
+        import datetime
+        import uuid
+        from pathlib import Path
+        from tcm.agent.synthesizer import _dumps_output
+        uid = uuid.UUID(int=1)
+        text = _dumps_output({"at": datetime.datetime(2024, 1, 2), "id": uid, "path": Path("a/b")})
+        assert "2024-01-02T00:00:00" in text
+        assert str(uid) in text
+        assert '"a/b"' in text
+
+
+class TestSession:
+    def test_scratchpad_is_bounded(self, tmp_path):
+        from tcm.agent.config import Config
+        from tcm.agent.session import Session
+        session = Session(config=Config(data={"agent.scratchpad_max": 3}))
+        for i in range(5):
+            session.log(f"line {i}")
+        out = tmp_path / "scratch.txt"
+        session.save_scratchpad(out)
+        assert out.read_text().splitlines() == ["line 2", "line 3", "line 4"]
+
+    def test_transient_error_detection(self):
+        from tcm.agent.config import Config
+        from tcm.agent.session import Session
+        session = Session(config=Config())
+        assert session._is_transient_tool_error("Read Timed Out")
+        assert session._is_transient_tool_error("HTTP 503 Service Unavailable")
+        assert not session._is_transient_tool_error("KeyError: 'herb'")
+        assert not session._is_transient_tool_error(None)
+
+    def test_repeated_transient_failures_suppress_tool(self):
+        from tcm.agent.config import Config
+        from tcm.agent.session import Session
+        session = Session(config=Config(data={"agent.tool_health_fail_threshold": 2}))
+        session.record_tool_failure("pubmed.search", "connection reset")
+        assert session.tool_health_suppressed_tools() == set()
+        session.record_tool_failure("pubmed.search", "connection reset")
+        assert session.tool_health_suppressed_tools() == {"pubmed.search"}
+        session.record_tool_success("pubmed.search")
+        assert session.tool_health_suppressed_tools() == set()
+
+    def test_tool_health_threshold_follows_config_set(self):
+        from tcm.agent.config import Config
+        from tcm.agent.session import Session
+        session = Session(config=Config(data={"agent.tool_health_fail_threshold": 3}))
+        session.config.set("agent.tool_health_fail_threshold", 1)
+        session.record_tool_failure("pubmed.search", "timeout")
+        assert session.tool_health_suppressed_tools() == {"pubmed.search"}
@@ -78,3 +78,59 @@ def test_config_api_key(monkeypatch):
     # Test env var fallback
     monkeypatch.setenv("OPENAI_API_KEY", "sk-openai-test")
     assert cfg.llm_api_key("openai") == "sk-openai-test"
+
+
+def test_config_load_cache_invalidated_on_save(tmp_path, monkeypatch):
+    from tcm.agent import config as config_mod
+    monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config_mod, "CONFIG_FILE", tmp_path / "config.json")
+
+    from tcm.agent.config import Config
+    Config(data={"llm.model": "first"}).save()
+    first = Config.load()
+    first.set("llm.model", "mutated")  # must not leak into the cache
+    assert Config.load().get("llm.model") == "first"
+
+    Config(data={"llm.model": "second"}).save()
+    assert Config.load().get("llm.model") == "second"
+
+
+def test_config_save_is_atomic(tmp_path, monkeypatch):
+    from tcm.agent import config as config_mod
+    monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config_mod, "CONFIG_FILE", tmp_path / "config.json")
+
+    from tcm.agent.config import Config
+    Config(data={"llm.model": "test-model"}).save()
+    assert json.loads((tmp_path / "config.json").read_text()) == {"llm.model": "test-model"}
+    assert not (tmp_path / "config.json.tmp").exists()
+
+
+def test_config_save_load_without_orjson(tmp_path, monkeypatch):
+    from tcm.agent import config as config_mod
+    monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config_mod, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(config_mod, "orjson", None)
+
+    from tcm.agent.config import Config
+    Config(data={"ui.language": "zh", "llm.model": "测试"}).save()
+    loaded = Config.load()
+    assert loaded.get("llm.model") == "测试"
+
+
+def test_mask_secret_and_provider_order():
+    from tcm.agent.config import PROVIDERS_SORTED, mask_secret
+    assert mask_secret("sk-ant-1234567890abcd") == "sk-ant-...abcd"
+    assert mask_secret("short") == "***"
+    primaries = [name for name, spec in PROVIDERS_SORTED if spec.get("primary")]
+    assert [name for name, _ in PROVIDERS_SORTED[:len(primaries)]] == primaries
+
+
+def test_api_key_env_changes_are_seen(monkeypatch):
+    from tcm.agent.config import Config
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-old")
+    cfg = Config()
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-new")
+    assert cfg.llm_api_key("openai") == "sk-new"
+    monkeypatch.delenv("OPENAI_API_KEY")
+    assert cfg.llm_api_key("openai") is None
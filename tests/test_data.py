@@ -0,0 +1,367 @@
+"""Tests for tcm.data.downloader archive handling."""
+
+import zipfile
+
+
+class TestExtractArchive:
+    def _make_zip(self, path, n):
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for i in range(n):
+                zf.writestr(f"data/part{i % 3}/file{i}.txt", f"row {i}\n" * 100)
+
+    def test_parallel_zip_extract(self, tmp_path):
+        from tcm.data.downloader import _extract_archive
+        archive = tmp_path / "bundle.zip"
+        self._make_zip(archive, 40)
+        dest = tmp_path / "out"
+        assert _extract_archive(archive, dest, remove_after=True)
+        files = sorted(p.name for p in dest.rglob("*.txt"))
+        assert len(files) == 40
+        assert (dest / "data/part1/file7.txt").read_text().startswith("row 7\n")
+        assert not archive.exists()
+
+    def test_small_zip_extract(self, tmp_path):
+        from tcm.data.downloader import _extract_archive
+        archive = tmp_path / "small.zip"
+        self._make_zip(archive, 2)
+        dest = tmp_path / "out"
+        assert _extract_archive(archive, dest)
+        assert len(list(dest.rglob("*.txt"))) == 2
+
+    def test_unknown_extension_not_handled(self, tmp_path):
+        from tcm.data.downloader import _extract_archive
+        plain = tmp_path / "notes.txt"
+        plain.write_text("hi")
+        assert _extract_archive(plain, tmp_path / "out") is False
+
+    def test_libarchive_rejects_outside_hardlink(self, tmp_path):
+        import io
+        import tarfile
+        import pytest
+        from tcm.data.downloader import _extract_archive, _libarchive
+        if _libarchive() is None:
+            pytest.skip("libarchive-c not available")
+        victim = tmp_path / "victim.txt"
+        victim.write_text("original")
+        archive = tmp_path / "evil.tar"
+        with tarfile.open(archive, "w") as tf:
+            link = tarfile.TarInfo("data/link")
+            link.type = tarfile.LNKTYPE
+            link.linkname = str(victim)
+            tf.addfile(link)
+            payload = tarfile.TarInfo("data/link")
+            payload.size = 6
+            tf.addfile(payload, io.BytesIO(b"pwned!"))
+        assert _extract_archive(archive, tmp_path / "out") is False
+        assert victim.read_text() == "original"
+
+    def test_unchanged_archive_skips_reextract(self, tmp_path, monkeypatch):
+        from tcm.data import downloader
+        archive = tmp_path / "bundle.zip"
+        self._make_zip(archive, 2)
+        dest = tmp_path / "out"
+        calls = []
+        real_extract = downloader._extract_zip
+        monkeypatch.setattr(downloader, "_extract_zip",
+                            lambda a, d: calls.append(a) or real_extract(a, d))
+
+        assert downloader._extract_archive(archive, dest, skip_unchanged=True)
+        assert downloader._extract_archive(archive, dest, skip_unchanged=True)
+        assert len(calls) == 1
+        assert (dest / ".source.sha256").read_text() == downloader._file_sha256(archive)
+
+        self._make_zip(archive, 3)
+        assert downloader._extract_archive(archive, dest, skip_unchanged=True)
+        assert len(calls) == 2
+
+    def _make_tar(self, path, mode):
+        import io
+        import tarfile
+        with tarfile.open(path, mode) as tf:
+            for i in range(3):
+                payload = f"row {i}\n".encode()
+                info = tarfile.TarInfo(f"data/file{i}.txt")
+                info.size = len(payload)
+                tf.addfile(info, io.BytesIO(payload))
+
+    def test_tar_extract(self, tmp_path):
+        from tcm.data.downloader import _extract_archive
+        for suffix, mode in ((".tar.gz", "w:gz"), (".tar.xz", "w:xz"), (".tar", "w")):
+            archive = tmp_path / f"bundle{suffix}"
+            self._make_tar(archive, mode)
+            dest = tmp_path / f"out{suffix}"
+            assert _extract_archive(archive, dest)
+            assert (dest / "data/file2.txt").read_text() == "row 2\n"
+
+    def test_tar_extract_without_libarchive(self, tmp_path, monkeypatch):
+        import lzma
+        from tcm.data import downloader
+        monkeypatch.setattr(downloader, "_libarchive", lambda: None)
+        for suffix, mode in ((".tar.gz", "w:gz"), (".tar.xz", "w:xz"), (".tar", "w")):
+            archive = tmp_path / f"bundle{suffix}"
+            self._make_tar(archive, mode)
+            dest = tmp_path / f"out{suffix}"
+            assert downloader._extract_archive(archive, dest)
+            assert (dest / "data/file2.txt").read_text() == "row 2\n"
+
+        # Record padding past the end-of-archive block, as `tar -b 2048` writes;
+        # the external decompressor must not be cut off while emitting it
+        plain = tmp_path / "padded.tar"
+        self._make_tar(plain, "w")
+        archive = tmp_path / "padded.tar.xz"
+        archive.write_bytes(lzma.compress(plain.read_bytes() + bytes(1 << 20)))
+        assert downloader._extract_archive(archive, tmp_path / "padded")
+        assert (tmp_path / "padded/data/file0.txt").read_text() == "row 0\n"
+
+    def test_libarchive_rejects_parent_paths(self, tmp_path):
+        import io
+        import tarfile
+        import pytest
+        from tcm.data.downloader import _extract_archive, _libarchive
+        if _libarchive() is None:
+            pytest.skip("libarchive-c not available")
+        archive = tmp_path / "evil.tar"
+        with tarfile.open(archive, "w") as tf:
+            info = tarfile.TarInfo("../escaped.txt")
+            info.size = 1
+            tf.addfile(info, io.BytesIO(b"x"))
+        assert _extract_archive(archive, tmp_path / "out") is False
+        assert not (tmp_path / "escaped.txt").exists()
+
+    def test_corrupt_tar_reports_failure(self, tmp_path):
+        from tcm.data.downloader import _extract_archive
+        archive = tmp_path / "broken.tar.xz"
+        archive.write_bytes(b"not an xz stream")
+        assert _extract_archive(archive, tmp_path / "out") is False
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.headers = {"content-length": str(len(body))}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_bytes(self, chunk_size=65_536):
+        for i in range(0, len(self.body), 7):
+            yield self.body[i:i + 7]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeClient:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, method, url):
+        return _FakeResponse(self.body)
+
+
+class TestHttpDownload:
+    def test_tarball_extracted_while_streaming(self, tmp_path, monkeypatch):
+        import io
+        import tarfile
+        from tcm.data import downloader
+
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+            payload = b"herb,compound\n" * 50
+            info = tarfile.TarInfo("tables/herbs.csv")
+            info.size = len(payload)
+            tf.addfile(info, io.BytesIO(payload))
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(buf.getvalue()))
+
+        ds = {"name": "Demo", "filename": "demo.tar.gz", "extract": True}
+        out = tmp_path / "demo"
+        out.mkdir()
+        assert downloader._http_download("demo", "https://example.org/demo.tar.gz", out, ds)
+        assert (out / "tables/herbs.csv").read_bytes().startswith(b"herb,compound\n")
+        assert not (out / "demo.tar.gz").exists()
+
+    def test_corrupt_tarball_fails(self, tmp_path, monkeypatch):
+        from tcm.data import downloader
+
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(b"garbage" * 100))
+        ds = {"name": "Demo", "filename": "demo.tar.gz", "extract": True}
+        assert downloader._http_download("demo", "https://example.org/demo.tar.gz", tmp_path, ds) is False
+
+    def test_plain_file_written_by_writer_thread(self, tmp_path, monkeypatch):
+        from tcm.data import downloader
+
+        body = bytes(range(256)) * 40
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(body))
+        ds = {"name": "Demo", "filename": "demo.csv", "extract": False}
+        assert downloader._http_download("demo", "https://example.org/demo.csv", tmp_path, ds)
+        assert (tmp_path / "demo.csv").read_bytes() == body
+
+    def test_crc_mismatch_rejects_download(self, tmp_path, monkeypatch):
+        import zlib
+        from tcm.data import downloader
+
+        body = b"id,name\n1,ginseng\n"
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(body))
+        ds = {"name": "Demo", "filename": "demo.csv", "extract": False, "crc32": zlib.crc32(body)}
+        assert downloader._http_download("demo", "https://example.org/demo.csv", tmp_path, ds)
+
+        ds["crc32"] ^= 1
+        assert downloader._http_download("demo", "https://example.org/demo.csv", tmp_path, ds) is False
+        assert not (tmp_path / "demo.csv").exists()
+
+    def test_crc_mismatch_discards_streamed_tarball(self, tmp_path, monkeypatch):
+        import io
+        import tarfile
+        import zlib
+        from tcm.data import downloader
+
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+            info = tarfile.TarInfo("a.txt")
+            info.size = 2
+            tf.addfile(info, io.BytesIO(b"hi"))
+        body = buf.getvalue()
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(body))
+        out = tmp_path / "demo"
+        out.mkdir()
+        ds = {"name": "Demo", "filename": "demo.tar.gz", "extract": True,
+              "crc32": zlib.crc32(body) ^ 1}
+
+        assert downloader._http_download("demo", "https://example.org/demo.tar.gz", out, ds) is False
+        assert not (out / "a.txt").exists()
+        assert not downloader._is_installed(out)
+        assert [p.name for p in tmp_path.iterdir()] == ["demo"]  # staging dir removed
+
+        ds["crc32"] ^= 1
+        assert downloader._http_download("demo", "https://example.org/demo.tar.gz", out, ds)
+        assert (out / "a.txt").read_bytes() == b"hi"
+        assert [p.name for p in tmp_path.iterdir()] == ["demo"]
+
+    def test_crc_covers_tar_record_padding(self, tmp_path, monkeypatch):
+        import io
+        import tarfile
+        import zlib
+        from tcm.data import downloader
+
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tf:
+            info = tarfile.TarInfo("a.txt")
+            info.size = 2
+            tf.addfile(info, io.BytesIO(b"hi"))
+        body = buf.getvalue() + bytes(256 * 1024)  # padding well past the pipe buffer
+        monkeypatch.setattr(downloader, "_shared_client", lambda: _FakeClient(body))
+        out = tmp_path / "demo"
+        out.mkdir()
+        ds = {"name": "Demo", "filename": "demo.tar", "extract": True, "crc32": zlib.crc32(body)}
+
+        assert downloader._http_download("demo", "https://example.org/demo.tar", out, ds)
+        assert (out / "a.txt").read_bytes() == b"hi"
+
+    def test_writer_failure_stops_download(self, tmp_path, monkeypatch):
+        from tcm.data import downloader
+
+        pulled = []
+
+        class _CountingResponse(_FakeResponse):
+            def iter_bytes(self, chunk_size=65_536):
+                for chunk in super().iter_bytes(chunk_size):
+                    pulled.append(chunk)
+                    yield chunk
+
+        body = b"x" * 7000
+        monkeypatch.setattr(downloader, "_shared_client",
+                            lambda: type("C", (), {"stream": lambda self, m, u: _CountingResponse(body)})())
+        ds = {"name": "Demo", "filename": "demo.csv", "extract": False}
+        # The writer cannot open its file, so the producer should give up early
+        assert downloader._http_download("demo", "https://example.org/demo.csv",
+                                         tmp_path / "missing", ds) is False
+        assert len(pulled) < len(body) // 7
+
+    def test_network_error_removes_partial_file(self, tmp_path, monkeypatch):
+        import httpx
+        from tcm.data import downloader
+
+        class _DroppedResponse(_FakeResponse):
+            def iter_bytes(self, chunk_size=65_536):
+                yield b"partial"
+                raise httpx.ReadError("connection reset")
+
+        monkeypatch.setattr(downloader, "_shared_client",
+                            lambda: type("C", (), {"stream": lambda self, m, u: _DroppedResponse(b"")})())
+        ds = {"name": "Demo", "filename": "demo.csv", "extract": False}
+        assert downloader._http_download("demo", "https://example.org/demo.csv", tmp_path, ds) is False
+        assert not (tmp_path / "demo.csv").exists()
+
+    def test_shared_client_is_reused(self):
+        from tcm.data import downloader
+        assert downloader._shared_client() is downloader._shared_client()
+
+
+class TestBundledInstall:
+    def test_install_herbs_roundtrip(self, tmp_path):
+        import json
+        from tcm.data.downloader import DATASETS, _install_bundled, _is_installed
+        from tcm.tools.herbs import HERB_DB
+        assert not _is_installed(tmp_path / "missing")
+        assert not _is_installed(tmp_path)
+        assert _install_bundled("herbs", tmp_path, DATASETS["herbs"])
+        assert _is_installed(tmp_path)
+        assert json.loads((tmp_path / "herbs.json").read_text(encoding="utf-8")) == HERB_DB
+
+    def test_install_without_orjson(self, tmp_path, monkeypatch):
+        import json
+        from tcm.data import downloader
+        from tcm.tools.formulas import FORMULA_DB
+        monkeypatch.setattr(downloader, "orjson", None)
+        assert downloader._install_bundled("formulas", tmp_path, downloader.DATASETS["formulas"])
+        assert json.loads((tmp_path / "formulas.json").read_text(encoding="utf-8")) == FORMULA_DB
+
+
+class TestSaveConfig:
+    def test_unchanged_path_skips_write(self, tmp_path, monkeypatch):
+        from tcm.agent import config as config_mod
+        from tcm.data import downloader
+        monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config_mod, "CONFIG_FILE", tmp_path / "config.json")
+        saves = []
+        real_save = config_mod.Config.save
+        monkeypatch.setattr(config_mod.Config, "save", lambda self: saves.append(1) or real_save(self))
+
+        downloader._save_config("herbs", tmp_path / "herbs")
+        downloader._save_config("herbs", tmp_path / "herbs")
+        assert len(saves) == 1
+        assert config_mod.Config.load().get("data.herbs") == str(tmp_path / "herbs")
+
+
+class TestDatasetStatus:
+    def test_status_rows(self, tmp_path, monkeypatch):
+        from tcm.agent import config as config_mod
+        from tcm.data import downloader
+        monkeypatch.setattr(config_mod, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config_mod, "CONFIG_FILE", tmp_path / "config.json")
+        herbs = tmp_path / "herbs"
+        herbs.mkdir()
+        (herbs / "herbs.json").write_text("{}")
+        downloader._save_config("herbs", herbs)
+        downloader._save_config("formulas", tmp_path / "missing")
+
+        table = downloader.dataset_status()
+        status = dict(zip(table.columns[0]._cells, table.columns[2]._cells))
+        assert "installed" in status["Herb Monographs"] and "not" not in status["Herb Monographs"]
+        assert "not installed" in status["Classical Formulas"]
+        assert table.row_count == len(downloader.DATASETS)
+
+
+class TestModuleDefinitions:
+    def test_public_entry_points_defined_once(self):
+        import ast
+        import inspect
+        from tcm.data import downloader
+        tree = ast.parse(inspect.getsource(downloader))
+        names = [n.name for n in tree.body if isinstance(n, ast.FunctionDef)]
+        for name in ("download_dataset", "import_dataset", "dataset_status"):
+            assert names.count(name) == 1
+        assert downloader.download_dataset.__doc__.startswith("Download / install")
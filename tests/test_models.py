@@ -2,7 +2,12 @@
 
 from tcm.models.llm import (
     MODEL_CATALOG,
+    MODEL_IDS,
+    LLMClient,
+    LLMResponse,
     ModelInfo,
+    ResponseCache,
+    UsageTracker,
     list_models,
     model_pricing,
     resolve_provider,
@@ -49,6 +54,11 @@ class TestResolveProvider:
     def test_empty_string(self):
         assert resolve_provider("") is None
 
+    def test_prefix_case_insensitive(self):
+        assert resolve_provider("Qwen2.5-72B") == "qwen"
+        assert resolve_provider("GEMINI-exp-1206") == "google"
+        assert resolve_provider("MiniMax-Text-01") == "minimax"
+
 
 class TestListModels:
     def test_list_all(self):
@@ -68,6 +78,19 @@ class TestListModels:
     def test_filter_unknown(self):
         assert list_models(provider="llama") == []
 
+    def test_model_ids_match_catalog(self):
+        assert MODEL_IDS == set(MODEL_CATALOG)
+
+    def test_catalog_is_read_only(self):
+        import dataclasses
+        import pytest
+        info = MODEL_CATALOG["gpt-4o"]
+        with pytest.raises(TypeError):
+            MODEL_CATALOG["fake"] = info
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.input_price = 0.0
+        assert {info: 1}[MODEL_CATALOG["gpt-4o"]] == 1
+
 
 class TestModelPricing:
     def test_known_model(self):
@@ -82,6 +105,34 @@ class TestModelPricing:
         assert model_pricing("nonexistent-model") is None
 
 
+class TestUsageTracker:
+    def test_running_totals(self):
+        tracker = UsageTracker()
+        assert tracker.summary() == "No LLM calls made."
+        tracker.record("gpt-4o", {"input": 1_000_000, "output": 100_000})
+        tracker.record("unknown-model", {"input": 10, "output": 5})
+        tracker.record("gpt-4o", {})
+        assert tracker.call_count == 2
+        assert tracker.total_input_tokens == 1_000_010
+        assert tracker.total_output_tokens == 100_005
+        assert tracker.total_cost == 2.50 + 1.00
+        assert tracker.calls[1] == {"model": "unknown-model", "input": 10, "output": 5, "cost": 0.0}
+        assert "2 LLM calls" in tracker.summary()
+
+        tracker.reset()
+        assert tracker.call_count == 0 and tracker.total_tokens == 0 and tracker.calls == []
+
+    def test_concurrent_records_and_float_counts(self):
+        from concurrent.futures import ThreadPoolExecutor
+        tracker = UsageTracker()
+        tracker.record("gpt-4o", {"input": 3.0, "output": 1.0})
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: tracker.record("gpt-4o", {"input": 2, "output": 1}), range(2000)))
+        assert tracker.call_count == 2001
+        assert tracker.total_input_tokens == 4003
+        assert tracker.total_output_tokens == 2001
+
+
 class TestConfigAutoDetect:
     def test_set_openai_model_auto_sets_provider(self):
         from tcm.agent.config import Config
@@ -113,3 +164,268 @@ class TestConfigAutoDetect:
         assert cfg.get("llm.provider") == "anthropic"
         cfg.set("llm.model", "gpt-4.1")
         assert cfg.get("llm.provider") == "openai"
+
+
+class TestResponseCache:
+    def _client(self, cache, calls):
+        llm = LLMClient(provider="openai", model="gpt-4o", api_key="sk-test", cache=cache)
+        llm._client = object()
+
+        def fake_chat(client, system, messages, temperature, max_tokens):
+            calls.append(messages)
+            return LLMResponse(content=f"answer {len(calls)}", model="gpt-4o",
+                               usage={"input": 10, "output": 2}, raw=object())
+
+        llm._chat_openai = fake_chat
+        return llm
+
+    def test_identical_requests_hit_cache(self, tmp_path):
+        calls = []
+        db = str(tmp_path / "cache" / "responses.sqlite")
+        llm = self._client(ResponseCache(path=db), calls)
+        msgs = [{"role": "user", "content": "plan this"}]
+
+        first = llm.chat("sys", msgs, temperature=0.1)
+        again = llm.chat("sys", msgs, temperature=0.1)
+        assert again.content == first.content == "answer 1"
+        assert again.raw is None
+        assert len(calls) == 1 and llm.usage.call_count == 1
+
+        llm.chat("sys", [{"role": "user", "content": "other"}], temperature=0.1)
+        llm.chat("sys", msgs, temperature=0.7)  # sampled: never cached
+        assert len(calls) == 3
+
+        # A fresh cache on the same file serves the persisted answer
+        calls2 = []
+        llm2 = self._client(ResponseCache(path=db), calls2)
+        assert llm2.chat("sys", msgs, temperature=0.1).content == "answer 1"
+        assert calls2 == []
+
+    def test_no_cache_by_default(self):
+        calls = []
+        llm = self._client(None, calls)
+        llm.chat("sys", [{"role": "user", "content": "q"}])
+        llm.chat("sys", [{"role": "user", "content": "q"}])
+        assert len(calls) == 2
+
+
+class TestChatMany:
+    def _jobs(self, n):
+        return [{"system": "sys", "messages": [{"role": "user", "content": f"q{i}"}]} for i in range(n)]
+
+    def test_pool_preserves_order(self):
+        import asyncio
+        llm = LLMClient(provider="openai", model="gpt-4o", api_key="sk-test")
+        llm._client = object()
+        llm._chat_openai = lambda client, system, messages, t, m: LLMResponse(
+            content=messages[0]["content"].upper(), model="gpt-4o", usage={"input": 1, "output": 1})
+        out = asyncio.run(llm.chat_many(self._jobs(5), max_concurrency=2))
+        assert [r.content for r in out] == ["Q0", "Q1", "Q2", "Q3", "Q4"]
+        assert llm.usage.call_count == 5
+
+    def test_openai_batch_with_fallback(self):
+        import asyncio
+        import json
+        from types import SimpleNamespace as NS
+
+        uploaded = {}
+
+        def create_file(file, purpose):
+            uploaded["lines"] = [json.loads(x) for x in file[1].decode().splitlines()]
+            return NS(id="file-in")
+
+        def content(file_id):
+            rows = []
+            for line in uploaded["lines"][:2]:  # the third job fails in the batch
+                body = {"choices": [{"message": {"content": "batched " + line["custom_id"]}}],
+                        "usage": {"prompt_tokens": 3, "completion_tokens": 1}}
+                rows.append(json.dumps({"custom_id": line["custom_id"],
+                                        "response": {"status_code": 200, "body": body}}))
+            return NS(text="\n".join(rows))
+
+        client = NS(
+            files=NS(create=create_file, content=content),
+            batches=NS(create=lambda **kw: NS(id="batch-1"),
+                       retrieve=lambda bid: NS(id=bid, status="completed", output_file_id="file-out")),
+        )
+        llm = LLMClient(provider="openai", model="gpt-4o", api_key="sk-test")
+        llm._client = client
+        llm._chat_openai = lambda c, system, messages, t, m: LLMResponse(
+            content="direct", model="gpt-4o", usage={"input": 1, "output": 1})
+
+        out = asyncio.run(llm.chat_many(self._jobs(3), use_batch_api=True))
+        assert [r.content for r in out] == ["batched 0", "batched 1", "direct"]
+        assert uploaded["lines"][2]["body"]["messages"][-1]["content"] == "q2"
+        assert llm.usage.total_input_tokens == 7
+
+
+class TestMessageBuilding:
+    def test_join_text_blocks_skips_empty_and_tool_blocks(self):
+        from types import SimpleNamespace as NS
+        from tcm.models.llm import _join_text_blocks
+        blocks = [NS(text="a"), NS(type="tool_use"), NS(text=""), NS(text="b")]
+        assert _join_text_blocks(blocks) == "a\nb"
+        assert _join_text_blocks(None) == ""
+
+    def test_google_contents_prepends_system_exchange(self):
+        from types import SimpleNamespace as NS
+        from tcm.models.llm import _google_contents
+        types = NS(Content=lambda role, parts: (role, parts[0]), Part=lambda text: text)
+        msgs = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "yo"}]
+        assert _google_contents(types, "", msgs) == [("user", "hi"), ("model", "yo")]
+        contents = _google_contents(types, "be brief", msgs)
+        assert [role for role, _ in contents] == ["user", "model", "user", "model"]
+        assert contents[0][1].endswith("be brief")
+
+
+class TestRouting:
+    def test_cheap_tier_picks_lowest_cost_in_provider(self):
+        llm = LLMClient(provider="openai", model="gpt-4o")
+        assert llm.route("cheap", prompt_tokens=1000) == "gpt-4.1-nano"
+        assert llm.route("reasoning") == "gpt-4o"
+        assert llm.route("cheap", candidates=["gpt-4o", "o3-mini"]) == "o3-mini"
+
+    def test_context_window_and_latency_filters(self):
+        llm = LLMClient(provider="openai", model="gpt-4o")
+        assert llm.route("cheap", prompt_tokens=500_000) == "gpt-4.1-nano"
+        assert llm.route("cheap", prompt_tokens=5_000_000) == "gpt-4o"  # nothing fits
+        llm.latency.update({"gpt-4.1-nano": 3.0, "gpt-4o-mini": 0.5})
+        assert llm.route("cheap", max_latency_s=1.0) == "gpt-4o-mini"
+        # Unmeasured models count as 0 s, so "fast" tries the cheapest untried one
+        assert llm.route("fast") == "gpt-4.1-mini"
+        llm.latency.update({m.id: 1.0 for m in list_models("openai") if m.id not in llm.latency})
+        assert llm.route("fast") == "gpt-4o-mini"
+
+    def test_chat_route_uses_routed_model_for_one_call(self, monkeypatch):
+        llm = LLMClient(provider="openai", model="gpt-4o", api_key="sk-test")
+        builds = []
+
+        def fake_get_client(self):
+            if self._client is None:
+                builds.append(1)
+                self._client = object()
+            return self._client
+
+        monkeypatch.setattr(LLMClient, "_get_client", fake_get_client)
+        monkeypatch.setattr(LLMClient, "_chat_openai", lambda self, c, s, m, t, n: LLMResponse(
+            content="ok", model=self.model, usage={"input": 1, "output": 1}))
+
+        for _ in range(2):
+            assert llm.chat("sys", [{"role": "user", "content": "q"}], route="cheap").model == "gpt-4.1-nano"
+        assert len(builds) == 1  # routed copies share the original's SDK client
+        assert llm.model == "gpt-4o"
+        assert llm.usage.calls[0]["model"] == "gpt-4.1-nano"
+        assert "gpt-4.1-nano" in llm.latency
+
+
+class TestSharedHttpClient:
+    def test_sdk_clients_share_one_pool(self):
+        import pytest
+        pytest.importorskip("openai")
+        clients = [LLMClient(provider=p, api_key="sk-test") for p in ("openai", "deepseek", "qwen")]
+        for llm in clients:
+            llm.warmup()
+        pools = {id(llm._client._client) for llm in clients}
+        assert len(pools) == 1
+
+
+class TestRetry:
+    def test_transient_error_classification(self):
+        from tcm.models.llm import _is_transient_error
+
+        class RateLimitError(Exception):
+            pass
+
+        class Throttled(RateLimitError):
+            pass
+
+        assert _is_transient_error(Throttled("slow down"))
+        assert _is_transient_error(RuntimeError("Error code: 529 - Overloaded"))
+        assert _is_transient_error(RuntimeError("Read timeout"))
+        assert not _is_transient_error(ValueError("model gpt-4o-5000 not found"))
+        assert not _is_transient_error(ValueError("invalid api key"))
+
+    def test_retries_transient_then_raises_permanent(self, monkeypatch):
+        import pytest
+        from tcm.models import llm as llm_mod
+        monkeypatch.setattr(llm_mod.time, "sleep", lambda s: None)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("HTTP 503 service unavailable")
+            return "ok"
+
+        def bad_request():
+            attempts.append(1)
+            raise ValueError("bad request")
+
+        client = LLMClient(provider="openai")
+        assert client._retry(flaky) == "ok"
+        with pytest.raises(ValueError):
+            client._retry(bad_request)
+        assert len(attempts) == 4  # permanent errors are not retried
+
+
+class TestStreamBytes:
+    def _client(self, monkeypatch, parts):
+        llm = LLMClient(provider="openai", model="gpt-4o")
+        monkeypatch.setattr(llm, "stream", lambda *a, **k: iter(parts))
+        return llm
+
+    def test_encodes_each_chunk(self, monkeypatch):
+        llm = self._client(monkeypatch, ["人参", " ginseng"])
+        assert list(llm.stream_bytes("sys", [])) == ["人参".encode(), b" ginseng"]
+
+    def test_accumulate_yields_views_and_returns_body(self, monkeypatch):
+        llm = self._client(monkeypatch, ["黄芪", " astragalus"])
+        seen = []
+        gen = llm.stream_bytes("sys", [], accumulate=True)
+        try:
+            while True:
+                seen.append(bytes(next(gen)))
+        except StopIteration as stop:
+            body = stop.value
+        assert seen == ["黄芪".encode(), b" astragalus"]
+        assert body.decode() == "黄芪 astragalus"
+
+    def test_openai_stream_skips_chunks_without_delta(self):
+        from types import SimpleNamespace as NS
+        chunks = [
+            NS(choices=[]),
+            NS(choices=None),
+            NS(choices=[NS(delta=None)]),
+            NS(choices=[NS(delta=NS(content="ok"))]),
+        ]
+        client = NS(chat=NS(completions=NS(create=lambda **kw: iter(chunks))))
+        llm = LLMClient(provider="openai", model="gpt-4o")
+        assert list(llm._stream_openai(client, "sys", [], 0.1, 16)) == ["ok"]
+
+
+class TestImportCost:
+    def test_catalog_use_does_not_import_sdks(self):
+        import subprocess
+        import sys
+        code = (
+            "import sys\n"
+            "from tcm.models.llm import list_models, resolve_provider, LLMClient\n"
+            "list_models('openai'); resolve_provider('gpt-x'); LLMClient('anthropic').route('cheap')\n"
+            "print(','.join(m for m in ('anthropic', 'openai', 'google.genai', 'cohere', 'httpx')"
+            " if m in sys.modules))\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == ""
+
+
+class TestJsonHelpers:
+    def test_dumps_bytes_with_and_without_orjson(self, monkeypatch):
+        import json
+        from tcm.models import llm as llm_mod
+        obj = {"b": [1, "人参"], "a": {"z": 1, "y": None}}
+        fast = llm_mod._dumps_bytes(obj, sort_keys=True)
+        monkeypatch.setattr(llm_mod, "orjson", None)
+        slow = llm_mod._dumps_bytes(obj, sort_keys=True)
+        assert fast == slow == json.dumps(obj, sort_keys=True, separators=(",", ":"),
+                                          ensure_ascii=False).encode()
+        assert llm_mod._loads(slow) == obj
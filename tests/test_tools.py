@@ -161,3 +161,11 @@ class TestToolRegistry:
         desc = registry.tool_descriptions_for_llm()
         assert "herbs.lookup" in desc
         assert "formulas.search" in desc
+
+    def test_registry_version_bumps_on_register(self):
+        from tcm.tools import ToolRegistry
+        reg = ToolRegistry()
+        before = reg.version
+        reg.register("demo.echo", "Echo", "demo")(lambda text="": text)
+        assert reg.version == before + 1
+        assert len(reg) == 1
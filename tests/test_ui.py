@@ -0,0 +1,27 @@
+"""Tests for tcm.ui helpers."""
+
+import io
+
+import pytest
+
+
+class TestSecureInput:
+    def test_reads_piped_stdin(self, monkeypatch, capsys):
+        from tcm.ui.secure_input import secure_input
+        monkeypatch.setattr("sys.stdin", io.StringIO("sk-test-123\n"))
+        assert secure_input("Key: ") == "sk-test-123"
+        assert capsys.readouterr().out == "Key: "
+
+    def test_closed_stdin_raises_eof(self, monkeypatch):
+        from tcm.ui.secure_input import secure_input
+        monkeypatch.setattr("sys.stdin", io.StringIO(""))
+        with pytest.raises(EOFError):
+            secure_input("Key: ")
+
+
+class TestAuthErrors:
+    def test_is_auth_error(self):
+        from tcm.ui.errors import is_auth_error
+        assert is_auth_error(RuntimeError("Error code: 401 - invalid x-api-key"))
+        assert is_auth_error(RuntimeError("Invalid API key provided"))
+        assert not is_auth_error(RuntimeError("rate limit exceeded"))